@@ -44,18 +44,52 @@
 ## GENERAL COMMENTS
 # Coordinates are always absolute from the top left corner
 # Display is 192x64 so legal values are x[0-191] y[0-63]
+import logging
+import os
 import time
+from contextlib import contextmanager
 
 import serial
-from binascii import hexlify
 import struct
 
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+# Module-wide debug default; instances can still opt in with _debug=True.
+# Guarded by __debug__ so python -O strips the checks from the hot paths.
+_DEBUG = False
+
+logger = logging.getLogger(__name__)
+
+
+class GlkValueError(ValueError):
+    """A command argument is outside the range the display accepts"""
+
+
+class FileRefError(GlkValueError):
+    """A filesystem entry type or reference is out of range"""
+
+
+class FileTransferError(RuntimeError):
+    """The display declined a transfer, echoed corrupted data or did
+    not answer a query within the timeout"""
+
 
 class PyMoGlk:
+    # Fixed attribute layout: no per-instance __dict__, attribute access
+    # becomes a C-level slot fetch on the hot send/read paths
+    __slots__ = ('name', 'hsize', 'vsize', 'mode', 'port', '_DEBUG',
+                 '_batch_buf', '_batch_depth', '_scratch', '_scratch_mv',
+                 '_state', '_send', '_read', '_write', '_readinto', '_fd',
+                 '_rx_buf', '_rx_mv', '_rx_pos',
+                 '_version', '_module_type')
+
     ##COMMUNICATION
-    _CMD_INIT = int(0xFE)
+    _CMD_INIT = 0xFE
     # (Must be issued before any command)
-    _CMD_FLOW_CONTROL_ON = int(0x3A)
+    _CMD_FLOW_CONTROL_ON = 0x3A
     #                    full[0-128]
     #                    (Number of bytes before almost full
     #                     0: full)
@@ -63,26 +97,26 @@ class PyMoGlk:
     #                    (Number of bytes before almost empty
     #                     128: empty)
 
-    _RET_ALMOST_FULL = int(0xFE)
-    _RET_ALMOST_EMPTY = int(0xFF)
+    _RET_ALMOST_FULL = 0xFE
+    _RET_ALMOST_EMPTY = 0xFF
 
-    _CMD_FLOW_CONTROL_OFF = int(0x3B)
+    _CMD_FLOW_CONTROL_OFF = 0x3B
 
-    _CMD_I2C_ADDRESS = int(0x33)
+    _CMD_I2C_ADDRESS = 0x33
 
-    _CMD_BAUD_RATE = int(0x39)
+    _CMD_BAUD_RATE = 0x39
     #                    speed[See table below]
 
-    _BAUD_RATE_9600 = int(0xCF)
-    _BAUD_RATE_14400 = int(0x8A)
-    _BAUD_RATE_19200 = int(0x67)
-    _BAUD_RATE_28800 = int(0x44)
-    _BAUD_RATE_38400 = int(0x33)
-    _BAUD_RATE_57600 = int(0x22)
-    _BAUD_RATE_76800 = int(0x19)
-    _BAUD_RATE_115200 = int(0x10)
+    _BAUD_RATE_9600 = 0xCF
+    _BAUD_RATE_14400 = 0x8A
+    _BAUD_RATE_19200 = 0x67
+    _BAUD_RATE_28800 = 0x44
+    _BAUD_RATE_38400 = 0x33
+    _BAUD_RATE_57600 = 0x22
+    _BAUD_RATE_76800 = 0x19
+    _BAUD_RATE_115200 = 0x10
 
-    _CMD_NON_STANDARD_BAUD_RATE = int(0xA4)
+    _CMD_NON_STANDARD_BAUD_RATE = 0xA4
     #                    speed[12-2047]
     #                    (2 bytes,
     #                    LSB then MSB,
@@ -113,16 +147,16 @@ class PyMoGlk:
 
     # TODO: implement font file format
 
-    _CMD_UPLOAD_FONT = int(0x24)
+    _CMD_UPLOAD_FONT = 0x24
     #                    fontid
     #                    lsbsize
     #                    msbsize
     #                    fontfile
     # (Don't forget to set the new font metrics,
     #  see FILESYSTEM file transfer protocol)
-    _CMD_USE_FONT = int(0x31)
+    _CMD_USE_FONT = 0x31
     #                    fontid
-    _CMD_FONT_METRICS = int(0x32)
+    _CMD_FONT_METRICS = 0x32
     #                    lm
     #                    (Left Margin: Location in pi\xels)
     #                    tm
@@ -134,40 +168,40 @@ class PyMoGlk:
     #                    srow
     #                    (Scroll Row:
     #                    Y location of last row in pi\xels)
-    _CMD_BOX_SPACE_MODE = int(0xAC)
+    _CMD_BOX_SPACE_MODE = 0xAC
     #                    value[0-1]
     #                    (0: Off,
     #                     1: On)
 
     ## TEXT
-    _LINE_FEED = int(0x0A)
+    _LINE_FEED = 0x0A
 
-    _CMD_HOME = int(0x48)
-    _CMD_CURSOR_POSITION = int(0x47)
+    _CMD_HOME = 0x48
+    _CMD_CURSOR_POSITION = 0x47
     #                    col
     #                    row
     #                    (Derived from current font base size)
-    _CMD_CURSOR_COORDINATE = int(0x79)
+    _CMD_CURSOR_COORDINATE = 0x79
     #                    x
     #                    y
-    _CMD_AUTO_SCROLL_ON = int(0x51)
-    _CMD_AUTO_SCROLL_OFF = int(0x52)
+    _CMD_AUTO_SCROLL_ON = 0x51
+    _CMD_AUTO_SCROLL_OFF = 0x52
 
     ## BITMAPS
     # BITMAP FILE FORMAT
     #  The bitmap is encoded into bytes horizontally
 
-    _CMD_UPLOAD_BMP = int(0x5E)
+    _CMD_UPLOAD_BMP = 0x5E
     #                    bitmapid
     #                    lsbsize
     #                    msbsize
     #                    bitmapfile
     # (see FILESYSTEM file transfer protocol)
-    _CMD_DRAW_MEMORY_BMP = int(0x62)
+    _CMD_DRAW_MEMORY_BMP = 0x62
     #                    bitmapid
     #                    x
     #                    y
-    _CMD_DRAW_BMP = int(0x64)
+    _CMD_DRAW_BMP = 0x64
     #                    x
     #                    y
     #                    width
@@ -175,23 +209,23 @@ class PyMoGlk:
     #                    data
 
     ## BAR GRAPHS & DRAWING
-    _CMD_DRAWING_COLOR = int(0x63)
+    _CMD_DRAWING_COLOR = 0x63
     #                    color[0-255]
     #                    (0:     White,
     #                     1-255: Black)
-    _CMD_DRAW_PIXEL = int(0x70)
+    _CMD_DRAW_PIXEL = 0x70
     #                    x
     #                    y
-    _CMD_DRAW_LINE = int(0x6C)
+    _CMD_DRAW_LINE = 0x6C
     #                    x1
     #                    y1
     #                    x2
     #                    y2
     # (Lines may interpolate differently Left to Right and Right to Left)
-    _CMD_CONTINUE_LINE = int(0x65)
+    _CMD_CONTINUE_LINE = 0x65
     #                    x
     #                    y
-    _CMD_DRAW_RECTANGLE = int(0x72)
+    _CMD_DRAW_RECTANGLE = 0x72
     #                    color[0-255]
     #                    (0:     White,
     #                     1-255: Black)
@@ -199,7 +233,7 @@ class PyMoGlk:
     #                    y1
     #                    x2
     #                    y2
-    _CMD_DRAW_SOLID_RECTANGLE = int(0x78)
+    _CMD_DRAW_SOLID_RECTANGLE = 0x78
     #                    color[0-255]
     #                    (0:     White,
     #                     1-255: Black)
@@ -207,7 +241,7 @@ class PyMoGlk:
     #                    y1
     #                    x2
     #                    y2
-    _CMD_INITIALIZE_BAR_GRAPH = int(0x67)
+    _CMD_INITIALIZE_BAR_GRAPH = 0x67
     #                    bgid[0-15]
     #                    type[0-3]
     #                    (0: Vertical from bottom,
@@ -221,11 +255,11 @@ class PyMoGlk:
     #                    y2
     #                    (y1<y2)
     # (Beware of overlapping bar graphs)
-    _CMD_DRAW_BAR_GRAPH = int(0x69)
+    _CMD_DRAW_BAR_GRAPH = 0x69
     #                    bgid[0-15]
     #                    value
     #                    (In pi\xels)
-    _CMD_INITIALIZE_STRIP_CHART = int(0x6A)
+    _CMD_INITIALIZE_STRIP_CHART = 0x6A
     #                    scid[0-6]
     #                    x1
     #                    y1
@@ -233,7 +267,7 @@ class PyMoGlk:
     #                    (x1<x2)
     #                    y2
     #                    (y1<y2)
-    _CMD_SHIFT_STRIP_CHART = int(0x6B)
+    _CMD_SHIFT_STRIP_CHART = 0x6B
     #                    ref
     #                    (LSB: scid,
     #                     MSB: direction
@@ -251,11 +285,11 @@ class PyMoGlk:
     #    Red             1   0
     #    Off             1   1
 
-    _CMD_GPO_OFF = int(0x56)
+    _CMD_GPO_OFF = 0x56
     #                    num[1-6]
-    _CMD_GPO_ON = int(0x57)
+    _CMD_GPO_ON = 0x57
     #                    num[1-6]
-    _CMD_STARTUP_GPO_STATE = int(0xC3)
+    _CMD_STARTUP_GPO_STATE = 0xC3
     #                    num[1-6]
     #                    state[0-1]
     #                    (0: Off,
@@ -264,40 +298,40 @@ class PyMoGlk:
 
     ## KEYPAD
     # Default layout:
-    _RET_UP = int(0x42)
-    _RET_DOWN = int(0x48)
-    _RET_LEFT = int(0x44)
-    _RET_RIGHT = int(0x43)
-    _RET_CENTER = int(0x45)
-    _RET_TOP = int(0x41)
-    _RET_BOTTOM = int(0x47)
-    _RET_RELEASE_UP = int(0x62)
-    _RET_RELEASE_DOWN = int(0x68)
-    _RET_RELEASE_LEFT = int(0x64)
-    _RET_RELEASE_RIGHT = int(0x63)
-    _RET_RELEASE_CENTER = int(0x65)
-    _RET_RELEASE_TOP = int(0x61)
-    _RET_RELEASE_BOTTOM = int(0x67)
-
-    _CMD_AUTO_TRANSMIT_KEY_ON = int(0x41)
-    _CMD_AUTO_TRANSMIT_KEY_OFF = int(0x4F)
+    _RET_UP = 0x42
+    _RET_DOWN = 0x48
+    _RET_LEFT = 0x44
+    _RET_RIGHT = 0x43
+    _RET_CENTER = 0x45
+    _RET_TOP = 0x41
+    _RET_BOTTOM = 0x47
+    _RET_RELEASE_UP = 0x62
+    _RET_RELEASE_DOWN = 0x68
+    _RET_RELEASE_LEFT = 0x64
+    _RET_RELEASE_RIGHT = 0x63
+    _RET_RELEASE_CENTER = 0x65
+    _RET_RELEASE_TOP = 0x61
+    _RET_RELEASE_BOTTOM = 0x67
+
+    _CMD_AUTO_TRANSMIT_KEY_ON = 0x41
+    _CMD_AUTO_TRANSMIT_KEY_OFF = 0x4F
     # (The keypad buffer is reset after 10 key presses)
-    _CMD_POLL_KEY = int(0x26)
+    _CMD_POLL_KEY = 0x26
     # (Returned code MSB flags 'more than one key press in buffer')
 
-    _RET_NO_KEY = int(0x00)
+    _RET_NO_KEY = 0x00
 
-    _CMD_CLEAR_KEY_BUFFER = int(0x45)
-    _CMD_DEBOUNCE_TIME = int(0x55)
+    _CMD_CLEAR_KEY_BUFFER = 0x45
+    _CMD_DEBOUNCE_TIME = 0x55
     #                    time[0-255]
     #                    (6.554ms increments,
     #                     Default: 8)
-    _CMD_AUTO_REPEAT_MODE = int(0x7E)
+    _CMD_AUTO_REPEAT_MODE = 0x7E
     #                    mode[0-1]
     #                    (0: Resend Key,
     #                     1: Key Up/Down)
-    _CMD_AUTO_REPEAT_OFF = int(0x60)
-    _CMD_CUSTOM_KEYPAD_CODES = int(0xD5)
+    _CMD_AUTO_REPEAT_OFF = 0x60
+    _CMD_CUSTOM_KEYPAD_CODES = 0xD5
     #                    kdown[See table bellow]
     #                    (9 bytes)
     #                    kup[See table bellow]
@@ -316,20 +350,20 @@ class PyMoGlk:
     # FI\XME: Report it missing from codes list
 
     ## DISPLAY
-    _CMD_CLEAR_SCREEN = int(0x58)
-    _CMD_DISPLAY_ON = int(0x42)
+    _CMD_CLEAR_SCREEN = 0x58
+    _CMD_DISPLAY_ON = 0x42
     #                    min[0-90]
-    _CMD_DISPLAY_OFF = int(0x46)
-    _CMD_BRIGHTNESS = int(0x99)
+    _CMD_DISPLAY_OFF = 0x46
+    _CMD_BRIGHTNESS = 0x99
     #                    brightness[0-255]
     #                    (Default: 255)
-    _CMD_DEFAULT_BRIGHTNESS = int(0x98)
+    _CMD_DEFAULT_BRIGHTNESS = 0x98
     #                    brightness[0-255]
     #                    (Default: 255)
-    _CMD_CONTRAST = int(0x50)
+    _CMD_CONTRAST = 0x50
     #                    contrast[0-255]
     #                    (Default: 128)
-    _CMD_DEFAULT_CONTRAST = int(0x91)
+    _CMD_DEFAULT_CONTRAST = 0x91
     #                    contrast[0-255]
     #                    (Default: 128)
 
@@ -347,35 +381,33 @@ class PyMoGlk:
     #  (CMD_CONFIRM | CMD_DECLINE)
     #  -------------------End Loop-----------------------------
 
-    # TODO: Implement file transfer protocol
-
-    _RET_CONFIRM = int(0x01)
-    _RET_DECLINE = int(0x08)
+    _RET_CONFIRM = 0x01
+    _RET_DECLINE = 0x08
 
-    _CMD_CONFIRM = int(0x01)
-    _CMD_DECLINE = int(0x08)
+    _CMD_CONFIRM = 0x01
+    _CMD_DECLINE = 0x08
 
-    _CMD_WIPE_FILESYSTEM = int(0x21), int(0x59), int(0x21)
+    _CMD_WIPE_FILESYSTEM = 0x21, 0x59, 0x21
     # (Be carefull with this one!)
-    _CMD_DELETE_FILE = int(0xAD)
+    _CMD_DELETE_FILE = 0xAD
     #                    type[0-1]
     #                    (0: Font,
     #                     1: Bitmap)
     #                     fontid or bitmapid
-    _CMD_FREE_SPACE = int(0xAF)
+    _CMD_FREE_SPACE = 0xAF
 
     # FREE SPACE RETURN FORMAT
     # Free space size (4 bytes LSB to MSB)
     _RET_LENGTH_FREE_SPACE = 4
 
-    _CMD_DIRECTORY = int(0xB3)
+    _CMD_DIRECTORY = 0xB3
 
     # DIRECTORY RETURN FORMAT
     #  Header (1 byte)
     #    Number of entries (1 byte)
     #  File Entry (4 bytes)
     #    Flag (1 byte)
-    #    (int(0x00): Not used)
+    #    (0x00: Not used)
     #    FileID/Type (1 byte)
     #    (1st bit: File Type
     #    Next seven bits: FileID)
@@ -383,16 +415,16 @@ class PyMoGlk:
     #    File size MSB (1 byte)
     _RET_LENGTH_DIRECTORY = 5
 
-    _CMD_UPLOAD_FS = int(0xB0)
+    _CMD_UPLOAD_FS = 0xB0
     #                    fsimagefile
     #                    (Must be 16KB)
-    _CMD_DOWNLOAD_FILE = int(0xB2)
+    _CMD_DOWNLOAD_FILE = 0xB2
     #                    type[0-1]
     #                    (0: Font,
     #                     1: Bitmap)
     #                    fontid or bitmapid
 
-    _CMD_MOVE_FILE = int(0xB4)
+    _CMD_MOVE_FILE = 0xB4
     #                    oldtype[0-1]
     #                    (0: Font,
     #                     1: Bitmap)
@@ -401,7 +433,7 @@ class PyMoGlk:
     #                    (0: Font,
     #                     1: Bitmap)
     #                    newid
-    _CMD_DUMP_FS = int(0x30)
+    _CMD_DUMP_FS = 0x30
 
     #  DOWNLOAD_FILE AND DUMP_FS RETURN FORMAT
     #  File size (4 bytes)
@@ -410,14 +442,14 @@ class PyMoGlk:
     _RET_LENGTH_FILE_SIZE = 4
 
     # Undocumented command! Seems to dump the settings.
-    _CMD_DUMP_SETTINGS = int(0xD0)
+    _CMD_DUMP_SETTINGS = 0xD0
 
     ## SECURITY
-    _CMD_REMEMBER = int(0x93)
+    _CMD_REMEMBER = 0x93
     #                    value[0-1]
     #                    (0: Do not remember,
     #                     1: Remember)
-    _CMD_LOCK_LEVEL = int(0xCA), int(0xF5), int(0xA0)
+    _CMD_LOCK_LEVEL = 0xCA, 0xF5, 0xA0
     #                    level
     #                    (Lock bits:
     #                     0-2:  Reserved leave 0,
@@ -426,7 +458,7 @@ class PyMoGlk:
     #                     5:    Filesystem,
     #                     6:    Command,
     #                     7:    Display)
-    _CMD_DEFAULT_LOCK_LEVEL = int(0xCB), int(0xF5), int(0xA0)
+    _CMD_DEFAULT_LOCK_LEVEL = 0xCB, 0xF5, 0xA0
     #                    level
     #                    (Lock bits:
     #                     0-2:  Reserved leave 0,
@@ -437,121 +469,580 @@ class PyMoGlk:
     #                     7:    Display)
 
     # FIXME: Report it missing from codes list
-    _CMD_WRITE_CUSTOMER_DATA = int(0x34)
+    _CMD_WRITE_CUSTOMER_DATA = 0x34
     #                    data
     #                    (16B are accessible)
-    _CMD_READ_CUSTOMER_DATA = int(0x35)
+    _CMD_READ_CUSTOMER_DATA = 0x35
 
     #  READ_CUSTOMER_DATA RETURN FORMAT
     #  Data (16 bytes)
     _RET_LENGTH_CUSTOMER_DATA = 16
 
     ## MISC
-    _CMD_VERSION_NUMBER = int(0x36)
+    _CMD_VERSION_NUMBER = 0x36
 
     #  VERSION_NUMBER RETURN FORMAT
     #  Version (1 byte)
     #  (Represents the version number
     #   Hex  Version
-    #   int(0x19)  1.9
-    #   int(0x57)  5.7)
+    #   0x19  1.9
+    #   0x57  5.7)
     _RET_LENGTH_VERSION_NUMBER = 1
 
-    _CMD_MODULE_TYPE = int(0x37)
+    _CMD_MODULE_TYPE = 0x37
 
     #  MODULE_TYPE RETURN FORMAT
     #  Type (1 byte)
     #  (One of the following return codes)
     _RET_LENGTH_MODULE_TYPE = 1
-    _RET_LCD0821 = int(0x01)
-    _RET_LCD2021 = int(0x02)
-    _RET_LCD2041 = int(0x05)
-    _RET_LCD4021 = int(0x06)
-    _RET_LCD4041 = int(0x07)
-    _RET_LK202_25 = int(0x08)
-    _RET_LK204_25 = int(0x09)
-    _RET_LK404_55 = int(0x0A)
-    _RET_VFD2021 = int(0x0B)
-    _RET_VFD2041 = int(0x0C)
-    _RET_VFD4021 = int(0x0D)
-    _RET_VK202_25 = int(0x0E)
-    _RET_VK204_25 = int(0x0F)
-    _RET_GLC12232 = int(0x10)
-    _RET_GLC24064 = int(0x13)
-    _RET_GLK24064_25 = int(0x15)
-    _RET_GLK12232_25 = int(0x22)
-    _RET_GLK12232_25_SM = int(0x24)
-    _RET_GLK24064_16_1U_USB = int(0x25)
-    _RET_GLK24064_16_1U = int(0x26)
-    _RET_GLK19264_7T_1U_USB = int(0x27)
-    _RET_GLK12236_16 = int(0x28)
-    _RET_GLK12232_16_SM = int(0x29)
-    _RET_GLK19264_7T_1U = int(0x2A)
-    _RET_LK204_7T_1U = int(0x2B)
-    _RET_LK204_7T_1U_USB = int(0x2C)
-    _RET_LK404_AT = int(0x31)
-    _RET_MOS_AV_162A = int(0x32)
-    _RET_LK402_12 = int(0x33)
-    _RET_LK162_12 = int(0x34)
-    _RET_LK204_25PC = int(0x35)
-    _RET_LK202_24_USB = int(0x36)
-    _RET_VK202_24_USB = int(0x37)
-    _RET_LK204_24_USB = int(0x38)
-    _RET_VK204_24_USB = int(0x39)
-    _RET_PK162_12 = int(0x3A)
-    _RET_VK162_12 = int(0x3B)
-    _RET_MOS_AP_162A = int(0x3C)
-    _RET_PK202_25 = int(0x3D)
-    _RET_MOS_AL_162A = int(0x3E)
-    _RET_MOS_AL_202A = int(0x3F)
-    _RET_MOS_AV_202A = int(0x40)
-    _RET_MOS_AP_202A = int(0x41)
-    _RET_PK202_24_USB = int(0x42)
-    _RET_MOS_AL_082 = int(0x43)
-    _RET_MOS_AL_204 = int(0x44)
-    _RET_MOS_AV_204 = int(0x45)
-    _RET_MOS_AL_402 = int(0x46)
-    _RET_MOS_AV_402 = int(0x47)
-    _RET_LK082_12 = int(0x48)
-    _RET_VK402_12 = int(0x49)
-    _RET_VK404_55 = int(0x4A)
-    _RET_LK402_25 = int(0x4B)
-    _RET_VK402_25 = int(0x4C)
-    _RET_PK204_25 = int(0x4D)
-    _RET_MOS = int(0x4F)
-    _RET_MOI = int(0x50)
-    _RET_XBOARD_S = int(0x51)
-    _RET_XBOARD_I = int(0x52)
-    _RET_MOU = int(0x53)
-    _RET_XBOARD_U = int(0x54)
-    _RET_LK202_25_USB = int(0x55)
-    _RET_VK202_25_USB = int(0x56)
-    _RET_LK204_25_USB = int(0x57)
-    _RET_VK204_25_USB = int(0x58)
-    _RET_LK162_12_TC = int(0x5B)
-    _RET_GLK240128_25 = int(0x72)
-    _RET_LK404_25 = int(0x73)
-    _RET_VK404_25 = int(0x74)
-    _RET_GLT320240 = int(0x78)
-    _RET_GLT480282 = int(0x79)
-    _RET_GLT240128 = int(0x7A)
-
-    name = ''
-    hsize = 0
-    vsize = 0
-
-    def __init__(self, serialport='/dev/ttyUSB0', baudrate=19200, timeout=5, _debug=False):
-        self._DEBUG = _debug
+    _RET_LCD0821 = 0x01
+    _RET_LCD2021 = 0x02
+    _RET_LCD2041 = 0x05
+    _RET_LCD4021 = 0x06
+    _RET_LCD4041 = 0x07
+    _RET_LK202_25 = 0x08
+    _RET_LK204_25 = 0x09
+    _RET_LK404_55 = 0x0A
+    _RET_VFD2021 = 0x0B
+    _RET_VFD2041 = 0x0C
+    _RET_VFD4021 = 0x0D
+    _RET_VK202_25 = 0x0E
+    _RET_VK204_25 = 0x0F
+    _RET_GLC12232 = 0x10
+    _RET_GLC24064 = 0x13
+    _RET_GLK24064_25 = 0x15
+    _RET_GLK12232_25 = 0x22
+    _RET_GLK12232_25_SM = 0x24
+    _RET_GLK24064_16_1U_USB = 0x25
+    _RET_GLK24064_16_1U = 0x26
+    _RET_GLK19264_7T_1U_USB = 0x27
+    _RET_GLK12236_16 = 0x28
+    _RET_GLK12232_16_SM = 0x29
+    _RET_GLK19264_7T_1U = 0x2A
+    _RET_LK204_7T_1U = 0x2B
+    _RET_LK204_7T_1U_USB = 0x2C
+    _RET_LK404_AT = 0x31
+    _RET_MOS_AV_162A = 0x32
+    _RET_LK402_12 = 0x33
+    _RET_LK162_12 = 0x34
+    _RET_LK204_25PC = 0x35
+    _RET_LK202_24_USB = 0x36
+    _RET_VK202_24_USB = 0x37
+    _RET_LK204_24_USB = 0x38
+    _RET_VK204_24_USB = 0x39
+    _RET_PK162_12 = 0x3A
+    _RET_VK162_12 = 0x3B
+    _RET_MOS_AP_162A = 0x3C
+    _RET_PK202_25 = 0x3D
+    _RET_MOS_AL_162A = 0x3E
+    _RET_MOS_AL_202A = 0x3F
+    _RET_MOS_AV_202A = 0x40
+    _RET_MOS_AP_202A = 0x41
+    _RET_PK202_24_USB = 0x42
+    _RET_MOS_AL_082 = 0x43
+    _RET_MOS_AL_204 = 0x44
+    _RET_MOS_AV_204 = 0x45
+    _RET_MOS_AL_402 = 0x46
+    _RET_MOS_AV_402 = 0x47
+    _RET_LK082_12 = 0x48
+    _RET_VK402_12 = 0x49
+    _RET_VK404_55 = 0x4A
+    _RET_LK402_25 = 0x4B
+    _RET_VK402_25 = 0x4C
+    _RET_PK204_25 = 0x4D
+    _RET_MOS = 0x4F
+    _RET_MOI = 0x50
+    _RET_XBOARD_S = 0x51
+    _RET_XBOARD_I = 0x52
+    _RET_MOU = 0x53
+    _RET_XBOARD_U = 0x54
+    _RET_LK202_25_USB = 0x55
+    _RET_VK202_25_USB = 0x56
+    _RET_LK204_25_USB = 0x57
+    _RET_VK204_25_USB = 0x58
+    _RET_LK162_12_TC = 0x5B
+    _RET_GLK240128_25 = 0x72
+    _RET_LK404_25 = 0x73
+    _RET_VK404_25 = 0x74
+    _RET_GLT320240 = 0x78
+    _RET_GLT480282 = 0x79
+    _RET_GLT240128 = 0x7A
+
+    ## MODULE TYPE TABLE
+    # Reply byte -> module infos, built once at class load instead
+    # of a fresh dict literal on every read_type call
+    _LCD_INFOS = {
+        _RET_LCD0821: {
+            'name': 'LCD0821',
+        },
+        _RET_LCD2021: {
+            'name': 'LCD2021',
+        },
+        _RET_LCD2041: {
+            'name': 'LCD2041',
+        },
+        _RET_LCD4021: {
+            'name': 'LCD4021',
+        },
+        _RET_LCD4041: {
+            'name': 'LCD4041',
+        },
+        _RET_LK202_25: {
+            'name': 'LK202-25',
+        },
+        _RET_LK204_25: {
+            'name': 'LK204-25',
+        },
+        _RET_LK404_55: {
+            'name': 'LK404-55',
+        },
+        _RET_VFD2021: {
+            'name': 'VFD2021',
+        },
+        _RET_VFD2041: {
+            'name': 'VFD2041',
+        },
+        _RET_VFD4021: {
+            'name': 'VFD4021',
+        },
+        _RET_VK202_25: {
+            'name': 'VK202-25',
+        },
+        _RET_VK204_25: {
+            'name': 'VK204-25',
+        },
+        _RET_GLC12232: {
+            'name': 'GLC12232',
+            'hsize': 122,
+            'vsize': 32,
+        },
+        _RET_GLC24064: {
+            'name': 'GLC24064',
+            'hsize': 240,
+            'vsize': 64,
+        },
+        _RET_GLK24064_25: {
+            'name': 'GLK24064-25',
+            'hsize': 240,
+            'vsize': 64,
+        },
+        _RET_GLK12232_25: {
+            'name': 'GLK12232-25',
+            'hsize': 122,
+            'vsize': 32,
+        },
+        _RET_GLK12232_25_SM: {
+            'name': 'GLK12232-25-SM',
+            'hsize': 122,
+            'vsize': 32,
+        },
+        _RET_GLK24064_16_1U_USB: {
+            'name': 'GLK24064-16-1U-USB',
+            'hsize': 240,
+            'vsize': 64,
+        },
+        _RET_GLK24064_16_1U: {
+            'name': 'GLK24064-16-1U',
+            'hsize': 240,
+            'vsize': 64,
+        },
+        _RET_GLK19264_7T_1U_USB: {
+            'name': 'GLK19264-7T-1U-USB',
+            'hsize': 192,
+            'vsize': 64,
+        },
+        _RET_GLK12236_16: {
+            'name': 'GLK12236-16',
+            'hsize': 122,
+            'vsize': 36,
+        },
+        _RET_GLK12232_16_SM: {
+            'name': 'GLK12236-16-SM',
+            'hsize': 122,
+            'vsize': 36,
+        },
+        _RET_GLK19264_7T_1U: {
+            'name': 'GLK19264-7T-1U',
+            'hsize': 192,
+            'vsize': 64,
+        },
+        _RET_LK204_7T_1U: {
+            'name': 'LK204-7T-1U',
+        },
+        _RET_LK204_7T_1U_USB: {
+            'name': 'LK204-7T-1U-USB',
+        },
+        _RET_LK404_AT: {
+            'name': 'LK404-AT',
+        },
+        _RET_MOS_AV_162A: {
+            'name': 'MOS-AV-162A',
+        },
+        _RET_LK402_12: {
+            'name': 'LK402-12',
+        },
+        _RET_LK162_12: {
+            'name': 'LK162-12',
+        },
+        _RET_LK204_25PC: {
+            'name': 'LK204-25PC',
+        },
+        _RET_LK202_24_USB: {
+            'name': 'LK202-24-USB',
+        },
+        _RET_VK202_24_USB: {
+            'name': 'VK202-24-USB',
+        },
+        _RET_LK204_24_USB: {
+            'name': 'LK204-24-USB',
+        },
+        _RET_VK204_24_USB: {
+            'name': 'VK204-24-USB',
+        },
+        _RET_PK162_12: {
+            'name': 'PK162-12',
+        },
+        _RET_VK162_12: {
+            'name': 'VK162-12',
+        },
+        _RET_MOS_AP_162A: {
+            'name': 'MOS-AP-162A',
+        },
+        _RET_PK202_25: {
+            'name': 'PK202-25',
+        },
+        _RET_MOS_AL_162A: {
+            'name': 'MOS-AL-162A',
+        },
+        _RET_MOS_AL_202A: {
+            'name': 'MOS-AL-202A',
+        },
+        _RET_MOS_AV_202A: {
+            'name': 'MOS-AV-202A',
+        },
+        _RET_MOS_AP_202A: {
+            'name': 'MOS-AP-202A',
+        },
+        _RET_PK202_24_USB: {
+            'name': 'PK202-24-USB',
+        },
+        _RET_MOS_AL_082: {
+            'name': 'MOS-AL-082',
+        },
+        _RET_MOS_AL_204: {
+            'name': 'MOS-AL-204',
+        },
+        _RET_MOS_AV_204: {
+            'name': 'MOS-AV-204',
+        },
+        _RET_MOS_AL_402: {
+            'name': 'MOS-AL-402',
+        },
+        _RET_MOS_AV_402: {
+            'name': 'MOS-AV-402',
+        },
+        _RET_LK082_12: {
+            'name': 'LK082-12',
+        },
+        _RET_VK402_12: {
+            'name': 'VK402-12',
+        },
+        _RET_VK404_55: {
+            'name': 'VK404-55',
+        },
+        _RET_LK402_25: {
+            'name': 'LK402-25',
+        },
+        _RET_VK402_25: {
+            'name': 'VK402-25',
+        },
+        _RET_PK204_25: {
+            'name': 'PK204-25',
+        },
+        _RET_MOS: {
+            'name': 'MOS',
+        },
+        _RET_MOI: {
+            'name': 'MOI',
+        },
+        _RET_XBOARD_S: {
+            'name': 'XBOARD-S',
+        },
+        _RET_XBOARD_I: {
+            'name': 'XBOARD-I',
+        },
+        _RET_MOU: {
+            'name': 'MOU',
+        },
+        _RET_XBOARD_U: {
+            'name': 'XBOARD-U',
+        },
+        _RET_LK202_25_USB: {
+            'name': 'LK202-25-USB',
+        },
+        _RET_VK202_25_USB: {
+            'name': 'VK202-25-USB',
+        },
+        _RET_LK204_25_USB: {
+            'name': 'LK204-25-USB',
+        },
+        _RET_VK204_25_USB: {
+            'name': 'VK204-25-USB',
+        },
+        _RET_LK162_12_TC: {
+            'name': 'LK162-12-TC',
+        },
+        _RET_GLK240128_25: {
+            'name': 'GLK240128-25',
+            'hsize': 240,
+            'vsize': 128,
+        },
+        _RET_LK404_25: {
+            'name': 'LK404-25',
+        },
+        _RET_VK404_25: {
+            'name': 'VK404-25',
+        },
+        _RET_GLT320240: {
+            'name': 'GLT320240',
+            'hsize': 320,
+            'vsize': 240,
+        },
+        _RET_GLT480282: {
+            'name': 'GLT480282',
+            'hsize': 480,
+            'vsize': 282,
+        },
+        _RET_GLT240128: {
+            'name': 'GLT240128',
+            'hsize': 240,
+            'vsize': 128,
+        },
+        }
+
+    ## PRECOMPUTED COMMAND PREFIXES
+    # (_CMD_INIT plus the command byte(s), built once at class load
+    #  to avoid rebuilding the constant part of each message per call)
+    _PFX_FLOW_CONTROL_ON = bytes((_CMD_INIT, _CMD_FLOW_CONTROL_ON))
+    _PFX_FLOW_CONTROL_OFF = bytes((_CMD_INIT, _CMD_FLOW_CONTROL_OFF))
+    _PFX_I2C_ADDRESS = bytes((_CMD_INIT, _CMD_I2C_ADDRESS))
+    _PFX_BAUD_RATE = bytes((_CMD_INIT, _CMD_BAUD_RATE))
+    _PFX_NON_STANDARD_BAUD_RATE = bytes((_CMD_INIT, _CMD_NON_STANDARD_BAUD_RATE))
+    _PFX_UPLOAD_FONT = bytes((_CMD_INIT, _CMD_UPLOAD_FONT))
+    _PFX_USE_FONT = bytes((_CMD_INIT, _CMD_USE_FONT))
+    _PFX_FONT_METRICS = bytes((_CMD_INIT, _CMD_FONT_METRICS))
+    _PFX_BOX_SPACE_MODE = bytes((_CMD_INIT, _CMD_BOX_SPACE_MODE))
+    _PFX_HOME = bytes((_CMD_INIT, _CMD_HOME))
+    _PFX_CURSOR_POSITION = bytes((_CMD_INIT, _CMD_CURSOR_POSITION))
+    _PFX_CURSOR_COORDINATE = bytes((_CMD_INIT, _CMD_CURSOR_COORDINATE))
+    _PFX_AUTO_SCROLL_ON = bytes((_CMD_INIT, _CMD_AUTO_SCROLL_ON))
+    _PFX_AUTO_SCROLL_OFF = bytes((_CMD_INIT, _CMD_AUTO_SCROLL_OFF))
+    _PFX_UPLOAD_BMP = bytes((_CMD_INIT, _CMD_UPLOAD_BMP))
+    _PFX_DRAW_MEMORY_BMP = bytes((_CMD_INIT, _CMD_DRAW_MEMORY_BMP))
+    _PFX_DRAW_BMP = bytes((_CMD_INIT, _CMD_DRAW_BMP))
+    _PFX_DRAWING_COLOR = bytes((_CMD_INIT, _CMD_DRAWING_COLOR))
+    _PFX_DRAW_PIXEL = bytes((_CMD_INIT, _CMD_DRAW_PIXEL))
+    _PFX_DRAW_LINE = bytes((_CMD_INIT, _CMD_DRAW_LINE))
+    _PFX_CONTINUE_LINE = bytes((_CMD_INIT, _CMD_CONTINUE_LINE))
+    _PFX_DRAW_RECTANGLE = bytes((_CMD_INIT, _CMD_DRAW_RECTANGLE))
+    _PFX_DRAW_SOLID_RECTANGLE = bytes((_CMD_INIT, _CMD_DRAW_SOLID_RECTANGLE))
+    _PFX_INITIALIZE_BAR_GRAPH = bytes((_CMD_INIT, _CMD_INITIALIZE_BAR_GRAPH))
+    _PFX_DRAW_BAR_GRAPH = bytes((_CMD_INIT, _CMD_DRAW_BAR_GRAPH))
+    _PFX_INITIALIZE_STRIP_CHART = bytes((_CMD_INIT, _CMD_INITIALIZE_STRIP_CHART))
+    _PFX_SHIFT_STRIP_CHART = bytes((_CMD_INIT, _CMD_SHIFT_STRIP_CHART))
+    _PFX_GPO_OFF = bytes((_CMD_INIT, _CMD_GPO_OFF))
+    _PFX_GPO_ON = bytes((_CMD_INIT, _CMD_GPO_ON))
+    _PFX_STARTUP_GPO_STATE = bytes((_CMD_INIT, _CMD_STARTUP_GPO_STATE))
+    _PFX_AUTO_TRANSMIT_KEY_ON = bytes((_CMD_INIT, _CMD_AUTO_TRANSMIT_KEY_ON))
+    _PFX_AUTO_TRANSMIT_KEY_OFF = bytes((_CMD_INIT, _CMD_AUTO_TRANSMIT_KEY_OFF))
+    _PFX_POLL_KEY = bytes((_CMD_INIT, _CMD_POLL_KEY))
+    _PFX_CLEAR_KEY_BUFFER = bytes((_CMD_INIT, _CMD_CLEAR_KEY_BUFFER))
+    _PFX_DEBOUNCE_TIME = bytes((_CMD_INIT, _CMD_DEBOUNCE_TIME))
+    _PFX_AUTO_REPEAT_MODE = bytes((_CMD_INIT, _CMD_AUTO_REPEAT_MODE))
+    _PFX_AUTO_REPEAT_OFF = bytes((_CMD_INIT, _CMD_AUTO_REPEAT_OFF))
+    _PFX_CUSTOM_KEYPAD_CODES = bytes((_CMD_INIT, _CMD_CUSTOM_KEYPAD_CODES))
+    _PFX_CLEAR_SCREEN = bytes((_CMD_INIT, _CMD_CLEAR_SCREEN))
+    _PFX_DISPLAY_ON = bytes((_CMD_INIT, _CMD_DISPLAY_ON))
+    _PFX_DISPLAY_OFF = bytes((_CMD_INIT, _CMD_DISPLAY_OFF))
+    _PFX_BRIGHTNESS = bytes((_CMD_INIT, _CMD_BRIGHTNESS))
+    _PFX_DEFAULT_BRIGHTNESS = bytes((_CMD_INIT, _CMD_DEFAULT_BRIGHTNESS))
+    _PFX_CONTRAST = bytes((_CMD_INIT, _CMD_CONTRAST))
+    _PFX_DEFAULT_CONTRAST = bytes((_CMD_INIT, _CMD_DEFAULT_CONTRAST))
+    _PFX_WIPE_FILESYSTEM = bytes((_CMD_INIT,) + _CMD_WIPE_FILESYSTEM)
+    _PFX_DELETE_FILE = bytes((_CMD_INIT, _CMD_DELETE_FILE))
+    _PFX_FREE_SPACE = bytes((_CMD_INIT, _CMD_FREE_SPACE))
+    _PFX_DIRECTORY = bytes((_CMD_INIT, _CMD_DIRECTORY))
+    _PFX_UPLOAD_FS = bytes((_CMD_INIT, _CMD_UPLOAD_FS))
+    _PFX_DOWNLOAD_FILE = bytes((_CMD_INIT, _CMD_DOWNLOAD_FILE))
+    _PFX_MOVE_FILE = bytes((_CMD_INIT, _CMD_MOVE_FILE))
+    _PFX_REMEMBER = bytes((_CMD_INIT, _CMD_REMEMBER))
+    _PFX_LOCK_LEVEL = bytes((_CMD_INIT,) + _CMD_LOCK_LEVEL)
+    _PFX_DEFAULT_LOCK_LEVEL = bytes((_CMD_INIT,) + _CMD_DEFAULT_LOCK_LEVEL)
+    _PFX_DUMP_FS = bytes((_CMD_INIT, _CMD_DUMP_FS))
+    _PFX_WRITE_CUSTOMER_DATA = bytes((_CMD_INIT, _CMD_WRITE_CUSTOMER_DATA))
+    _PFX_READ_CUSTOMER_DATA = bytes((_CMD_INIT, _CMD_READ_CUSTOMER_DATA))
+    _PFX_VERSION_NUMBER = bytes((_CMD_INIT, _CMD_VERSION_NUMBER))
+    _PFX_MODULE_TYPE = bytes((_CMD_INIT, _CMD_MODULE_TYPE))
+
+    ## CACHED STRUCT PACKERS
+    # struct.Struct.pack bound once at class load: packing the command
+    # parameters is a single C call instead of a per-call bytes((...))
+    _pack1 = struct.Struct('B').pack
+    _pack2 = struct.Struct('BB').pack
+    _pack3 = struct.Struct('BBB').pack
+    _pack4 = struct.Struct('BBBB').pack
+    _pack5 = struct.Struct('BBBBB').pack
+    _pack6 = struct.Struct('BBBBBB').pack
+    # Little-endian 16-bit pack: emits LSB then MSB as the protocol wants
+    _pack_le16 = struct.Struct('<H').pack
+    # Reply decoders: the 4-byte LSB-to-MSB size word and the 4-byte
+    # directory entry (flag, type/id byte, 16-bit size)
+    _unpack_u32 = struct.Struct('<I').unpack
+    _iter_dir_entries = struct.Struct('<BBH').iter_unpack
+
+    ## LED COMMAND TABLE
+    # (num, color) -> both GPO commands prebuilt as one message, from
+    # the LEDS LAYOUT table above (low GPO first, then high GPO)
+    ## GPO COMMAND TABLE
+    # (num, state) -> the complete on/off frame; only twelve combinations
+    # exist, so GPO switching never builds bytes at call time
+    _GPO_CMDS = {}
+    for _num in range(1, 7):
+        _GPO_CMDS[(_num, True)] = bytes((_CMD_INIT, _CMD_GPO_ON, _num))
+        _GPO_CMDS[(_num, False)] = bytes((_CMD_INIT, _CMD_GPO_OFF, _num))
+    del _num
+
+    _LED_CMDS = {}
+    # Same key, with the startup-state commands appended: set_led with
+    # store=True is still a single write
+    _LED_STORE_CMDS = {}
+    for _num in (1, 2, 3):
+        for _color, _states in (('off', (True, True)),
+                                ('red', (False, True)),
+                                ('orange', (False, False)),
+                                ('green', (True, False))):
+            _LED_CMDS[(_num, _color)] = bytes((
+                _CMD_INIT, _CMD_GPO_ON if _states[0] else _CMD_GPO_OFF,
+                _num * 2 - 1,
+                _CMD_INIT, _CMD_GPO_ON if _states[1] else _CMD_GPO_OFF,
+                _num * 2))
+            _LED_STORE_CMDS[(_num, _color)] = _LED_CMDS[(_num, _color)] + bytes((
+                _CMD_INIT, _CMD_STARTUP_GPO_STATE, _num * 2 - 1, _states[0],
+                _CMD_INIT, _CMD_STARTUP_GPO_STATE, _num * 2, _states[1]))
+    del _num, _color, _states
+
+    # Whole-panel states: (color1, color2, color3) -> the six GPO
+    # commands for all three LEDs as one message, so an animation frame
+    # is a single lookup and a single write
+    _LED_SET_CMDS = {}
+    for _c1 in ('off', 'red', 'orange', 'green'):
+        for _c2 in ('off', 'red', 'orange', 'green'):
+            for _c3 in ('off', 'red', 'orange', 'green'):
+                _LED_SET_CMDS[(_c1, _c2, _c3)] = (_LED_CMDS[(1, _c1)]
+                                                  + _LED_CMDS[(2, _c2)]
+                                                  + _LED_CMDS[(3, _c3)])
+    del _c1, _c2, _c3
+
+
+    def __init__(self, serialport='/dev/ttyUSB0', baudrate=19200, timeout=5,
+                 negotiate_baudrate=None, rtscts=False, _debug=False):
+        # The display powers up at 19200, so that stays the default for
+        # first contact; pass negotiate_baudrate=115200 to switch the
+        # link right after connecting. At 19200 a 7-byte drawing
+        # command takes ~3.6 ms on the wire, so animation loops are
+        # bandwidth-bound until the link is raised.
+        self._DEBUG = _debug or _DEBUG
+        self.name = ''
+        self.hsize = 0
+        self.vsize = 0
         # TODO: I2C communication
         self.mode = 'serial'
-        self.port = serial.Serial(serialport, baudrate=baudrate, timeout=timeout)
+        self._batch_buf = None
+        self._batch_depth = 0
+        # Reusable scratch buffer for the highest-rate drawing commands,
+        # written in place and sent as a memoryview slice: no allocation
+        self._scratch = bytearray(16)
+        self._scratch_mv = memoryview(self._scratch)
+        # Shadow of the device state used to skip redundant setters
+        self._state = {}
+        # The hot entry points bound once: calling self._send costs a
+        # plain slot fetch instead of a class lookup plus a method bind
+        # on every command. The debug check happens here, once, so the
+        # production path carries neither the branch nor the hex dump
         if self._DEBUG:
-            print("DEBUG: port parameters")
-            print(self.port.getSettingsDict())
-
-    def __del__(self):
+            self._send = self._send_logged
+            self._read = self._read_logged
+        else:
+            self._send = self.send
+            self._read = self.read
+        # Reusable receive buffer: fixed-size replies land here through
+        # _read_into instead of a fresh allocation per read
+        # Sized to hold a full 16KB filesystem dump without falling
+        # back to a fresh allocation
+        self._rx_buf = bytearray(16384)
+        self._rx_mv = memoryview(self._rx_buf)
+        self._rx_pos = 0
+        # Hardware identity cannot change mid-process: cache it and
+        # skip the serial round trip on repeat queries
+        self._version = None
+        self._module_type = None
+        # write_timeout=None pins blocking writes: with a write timeout
+        # set, pyserial adds a select() round per write on POSIX
+        # rtscts enables hardware handshake for wiring that carries the
+        # RTS/CTS lines; the display's own in-band almost-full and
+        # almost-empty markers are handled in read() either way
+        self.port = serial.Serial(serialport, baudrate=baudrate, timeout=timeout,
+                                  write_timeout=None, rtscts=rtscts)
+        self._tune_port()
+        # The port's own hot entry points, bound once like _send/_read:
+        # no port attribute traversal per frame
+        self._write = self.port.write
+        self._readinto = self.port.readinto
+        # Raw descriptor for batch-flush bursts; None where the port
+        # has no usable fd (e.g. loop:// test ports)
+        try:
+            self._fd = self.port.fileno()
+        except (AttributeError, OSError, NotImplementedError):
+            self._fd = None
+        if negotiate_baudrate:
+            code = self._BAUD_CODES.get(negotiate_baudrate)
+            if code is None:
+                raise GlkValueError("unsupported baud rate")
+            self.set_baud_rate(code)
+        if __debug__ and self._DEBUG:
+            logger.debug("port parameters: %s", self.port.get_settings())
+
+    def _tune_port(self):
+        """Best-effort port tuning, ignoring what the platform refuses
+
+        On Linux the USB-serial latency timer holds received bytes for
+        up to 16 ms before waking the reader; low latency mode drops
+        that to 1 ms, which dominates the round trip of short queries.
+        On Windows, grow the driver buffers so bulk transfers need
+        fewer reads. Any stale bytes from before we opened the port
+        are dropped so the first reply is not misframed."""
+        try:
+            self.port.set_low_latency_mode(True)
+        except (AttributeError, NotImplementedError, ValueError, IOError):
+            pass
+        try:
+            self.port.set_buffer_size(rx_size=65536, tx_size=65536)
+        except (AttributeError, NotImplementedError):
+            pass
+        try:
+            self.port.reset_input_buffer()
+        except (AttributeError, IOError):
+            pass
+
+    def close(self):
         self.port.close()
 
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
     def _reconnect(self, baudrate=None, xonxoff=None):
         # TODO: I2C support
         self.port.close()
@@ -561,41 +1052,182 @@ class PyMoGlk:
         if xonxoff:
             self.port.xonxoff = xonxoff
 
+        self._version = None
+        self._module_type = None
+
         time.sleep(.1)
         self.port.open()
+        self._tune_port()
+        # Reopening hands the port a new descriptor: re-capture it so
+        # _raw_write does not burst into the stale (or recycled) fd
+        try:
+            self._fd = self.port.fileno()
+        except (AttributeError, OSError, NotImplementedError):
+            self._fd = None
 
     def write(self, text):
-        if self._DEBUG:
-            print("DEBUG: write(" + text + ")")
-        self.port.write(bytearray(text, 'ascii'))
+        if __debug__ and self._DEBUG:
+            logger.debug("write(%s)", text)
+        # Text output moves the cursor out from under the shadow state
+        self._state.pop('cursor', None)
+        # Through _send so text joins an open batch() like any command
+        self._send(text.encode('ascii'))
+
+    def invalidate_state(self):
+        """Forget the cached device state
+
+        Call after resetting the display or whenever something else may
+        have talked to it behind our back."""
+        self._state.clear()
 
     def send(self, message):
-        if self._DEBUG:
-            print("DEBUG: send(" + str(hexlify(message)) + ")")
-        self.port.write(message)
+        """Hand a command frame to the port (or the open batch)
+
+        Accepts bytes, bytearray or memoryview without copying. Setter
+        commands are fire and forget: the tty layer buffers the write,
+        nothing waits for the display unless a reply is read."""
+        if self._batch_buf is not None:
+            self._batch_buf += message
+            return
+        self._write(message)
+
+    def _send_logged(self, message):
+        logger.debug("send(%s)", bytes(message).hex())
+        self.send(message)
+
+    def _read_logged(self, size=1):
+        data = self.read(size)
+        logger.debug("read(%d) = %s", size, data.hex())
+        return data
+
+    @contextmanager
+    def batch(self):
+        """Coalesce every send() in the block into a single port write
+
+        Commands are framed by _CMD_INIT so the display parses them back
+        to back; batching them cuts one write() syscall per command.
+        Nesting is allowed: only the outermost block flushes."""
+        if self._batch_buf is None:
+            self._batch_buf = bytearray()
+        self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            self._batch_depth -= 1
+            if self._batch_depth == 0:
+                pending = self._batch_buf
+                self._batch_buf = None
+                if pending:
+                    # The bytearray goes out as is, no bytes copy; big
+                    # flushes skip pyserial's per-write machinery too
+                    self._raw_write(pending)
+
+    def _raw_write(self, buf):
+        """Write a burst straight to the port's descriptor
+
+        Bypasses pyserial's per-call is_open/timeout machinery, which
+        costs more than the burst itself on USB bulk endpoints. Short
+        writes are continued. Only used where timeouts do not apply
+        (batch flushes); without a usable fd it falls back to the
+        port's own write, and debug sessions keep the logged path."""
+        if self._fd is None or (__debug__ and self._DEBUG):
+            self._send(buf)
+            return
+        mv = memoryview(buf)
+        while mv:
+            mv = mv[os.write(self._fd, mv):]
+
+    def flush(self):
+        """Block until everything handed to the port has left the host"""
+        self.port.flush()
+
+    def send_batch(self, frames):
+        """Send several prebuilt command frames in one write
+
+        Complements batch() for callers that already hold the frames:
+        one join, one write, instead of one driver traversal each."""
+        self._send(b''.join(frames))
+
+    def query_many(self, queries):
+        """Pipeline several query commands over the wire
+
+        queries is a sequence of (frame, reply_length) pairs. All the
+        frames go out in one write before the first reply is read, so
+        the link's one-way latency is paid once for the whole group
+        instead of once per command. Replies come back in order."""
+        # Like read(): inside a batch() block the queued commands must
+        # go out before the queries, or their replies never come
+        if self._batch_buf:
+            self._write(self._batch_buf)
+            self._batch_buf.clear()
+        self._write(b''.join(frame for frame, _ in queries))
+        return [bytes(self._read_into(length)) for _, length in queries]
+
+    def _read_into(self, size):
+        """Read up to size bytes into the reusable receive ring
+
+        Returns a memoryview of the filled slice. A cursor advances
+        through the ring so consecutive replies land in distinct
+        slices; a view stays valid until the cursor wraps back over
+        it, so callers keeping data long term must copy it. Replies
+        larger than the ring fall back to a direct read."""
+        if size > len(self._rx_buf):
+            return memoryview(self.port.read(size))
+        pos = self._rx_pos
+        if pos + size > len(self._rx_buf):
+            pos = 0
+        n = self._readinto(self._rx_mv[pos:pos + size])
+        self._rx_pos = pos + n
+        return self._rx_mv[pos:pos + n]
+
+    def read_view(self, size=1):
+        """Read a reply as a zero-copy view into the receive ring
+
+        Same semantics as read() minus the bytes copy and the flow
+        control scan: suited to large transfers (dump_fs, customer
+        data) that are hexdumped, checksummed or written straight to
+        disk. Copy the view with bytes() before it risks being
+        overwritten by a later read."""
+        if self._batch_buf:
+            self._write(self._batch_buf)
+            self._batch_buf.clear()
+        return self._read_into(size)
 
     def read(self, size=1):
-        data = self.port.read(size=size)
+        # A query inside a batch() block must push the queued commands
+        # out first, or the reply we wait for was never requested
+        if self._batch_buf:
+            self._write(self._batch_buf)
+            self._batch_buf.clear()
+        data = bytes(self._read_into(size))
 
         # Flow control
         if self._RET_ALMOST_FULL in data:
             self.port.set_output_flow_control(False)
         if self._RET_ALMOST_EMPTY in data:
             self.port.set_output_flow_control(True)
-
-        if self._DEBUG:
-            print("DEBUG: read(" + str(size) + ") = " + str(hexlify(data)) + "")
         return data
 
+    def _xact(self, frame, nread):
+        # Fused send-then-read for query commands: one call site per
+        # command instead of two, through the same bound pair so
+        # batching and flow control behave as with separate calls
+        self._send(frame)
+        return self._read(nread)
+
     # 4.2
-    def turn_flow_control_on(self, full=0, empty=128):
+    def turn_flow_control_on(self, full=64, empty=16):
+        # Defaults leave headroom: the display raises almost-full while
+        # 64 of its 128 buffer bytes are still free, so bytes in flight
+        # at high baud rates do not overrun it
         # TODO: declare custom exceptions
         if self.mode == 'i2c':
             raise Exception
-        if (0 <= full <= 128) or (0 <= empty <= 128):
-            raise Exception
-        msg = bytearray([self._CMD_INIT, self._CMD_FLOW_CONTROL_ON, full, empty])
-        self.send(msg)
+        # The old predicate was inverted and raised on every valid call
+        if not 0 <= full <= 128 or not 0 <= empty <= 128:
+            raise GlkValueError("full and empty must be within 0..128")
+        msg = self._PFX_FLOW_CONTROL_ON + self._pack2(full, empty)
+        self._send(msg)
         self._reconnect(xonxoff=True)
 
     # 4.3
@@ -603,8 +1235,7 @@ class PyMoGlk:
         # TODO: declare custom exceptions
         if self.mode == 'i2c':
             raise Exception
-        msg = bytearray([self._CMD_INIT, self._CMD_FLOW_CONTROL_OFF])
-        self.send(msg)
+        self._send(self._PFX_FLOW_CONTROL_OFF)
         self._reconnect(xonxoff=False)
 
     def set_flow_control(self, state=False):
@@ -614,85 +1245,118 @@ class PyMoGlk:
             self.turn_flow_control_off()
 
         # 4.4
-    def set_i2c_slave_address(self, adr='\x50'):
-        # TODO: declare custom exceptions
-        if not '\x00' <= adr <= '\xFF':
-            raise Exception
-        msg = bytearray([self._CMD_INIT, self._CMD_I2C_ADDRESS, adr])
-        self.send(msg)
+    def set_i2c_slave_address(self, adr=0x50):
+        # Int compare instead of the old one-char string compare, which
+        # also broke _pack1 downstream
+        if not 0 <= adr <= 0xFF:
+            raise GlkValueError("address must be within 0..255")
+        msg = self._PFX_I2C_ADDRESS + self._pack1(adr)
+        self._send(msg)
         self._reconnect()
 
     # 4.5
+    # Code byte to actual rate, for validation and for reopening the
+    # port after the display switches over
+    _BAUD_RATES = {
+        _BAUD_RATE_9600: 9600,
+        _BAUD_RATE_14400: 14400,
+        _BAUD_RATE_19200: 19200,
+        _BAUD_RATE_28800: 28800,
+        _BAUD_RATE_38400: 38400,
+        _BAUD_RATE_57600: 57600,
+        _BAUD_RATE_76800: 76800,
+        _BAUD_RATE_115200: 115200,
+    }
+    # And the reverse, for callers that think in rates
+    _BAUD_CODES = {_rate: _code for _code, _rate in _BAUD_RATES.items()}
+
     def set_baud_rate(self, speed=_BAUD_RATE_19200):
-        # TODO: declare custom exceptions
-        if speed not in ('\xCF', '\x8A', '\x67', '\x44', '\x33', '\x22', '\x19', '\x10'):
-            raise Exception
-        msg = bytearray([self._CMD_INIT, self._CMD_BAUD_RATE, speed])
-        self.send(msg)
-        self._reconnect(baudrate=speed)
+        # The old check compared the int code against one-char strings,
+        # so every call raised; it also reconnected at the code value
+        # instead of the rate it stands for
+        if speed not in self._BAUD_RATES:
+            raise GlkValueError("unknown baud rate code")
+        msg = self._PFX_BAUD_RATE + self._pack1(speed)
+        self._send(msg)
+        self._reconnect(baudrate=self._BAUD_RATES[speed])
 
     # 4.6
     def set_non_standard_baud_rate(self, speed):
-        # TODO: declare custom exceptions
         if not 12 <= speed <= 2047:
-            raise Exception
-        # FIXME: Extract lsb and msb from speed
-        raise NotImplementedError
-        msg = bytearray([self._CMD_INIT, self._CMD_BAUD_RATE, lsb, msb])
-        self.send(msg)
-        self._reconnect(baudrate=speed)
+            raise GlkValueError("divisor must be within 12..2047")
+        # struct does the LSB/MSB split in one little-endian store
+        msg = self._PFX_NON_STANDARD_BAUD_RATE + self._pack_le16(speed)
+        self._send(msg)
+        # speed is the divisor from the manual's formula, not the baud
+        # rate itself: reopen the port at the rate it encodes
+        self._reconnect(baudrate=16000000 // (8 * (speed + 1)))
 
     #5.2
     def upload_font(self, ref, data):
-        # TODO: declare custom exceptions
+        """Upload a font file to the display's filesystem
+
+        data is the raw font file (header, character table, bitmap
+        data — see FONT FILE FORMAT). The frame carries the 16-bit
+        size LSB first, then the file bytes."""
         if self.mode == 'i2c':
             # FIXME: Should be a warning
             raise Exception
-        return NotImplemented
+        data = bytes(data)
+        self._send(self._PFX_UPLOAD_FONT + self._pack1(ref)
+                   + self._pack_le16(len(data)))
+        self._begin_transfer()
+        self._stream_acked(data)
 
     #5.3
     def set_font(self, ref):
-        msg = bytearray([self._CMD_INIT, self._CMD_USE_FONT, ref])
-        self.send(msg)
+        if self._state.get('font') == ref:
+            return
+        msg = self._PFX_USE_FONT + self._pack1(ref)
+        self._send(msg)
+        self._state['font'] = ref
 
     #5.4
     def set_font_metrics(self, lm, tm, csp, lsp, srow):
-        msg = bytearray([self._CMD_INIT, self._CMD_FONT_METRICS, lm, tm, csp, lsp, srow])
-        self.send(msg)
+        metrics = (lm, tm, csp, lsp, srow)
+        if self._state.get('font_metrics') == metrics:
+            return
+        msg = self._PFX_FONT_METRICS + self._pack5(lm, tm, csp, lsp, srow)
+        self._send(msg)
+        self._state['font_metrics'] = metrics
 
     # 5.5
     def set_box_space_mode(self, state=True):
-        if state:
-            value = '\x01'
-        else:
-            value = '\x00'
-        msg = bytearray([self._CMD_INIT, self._CMD_BOX_SPACE_MODE, value])
-        self.send(msg)
+        msg = self._PFX_BOX_SPACE_MODE + self._pack1(1 if state else 0)
+        self._send(msg)
 
     #6.2
     def set_cursor_home(self):
-        msg = bytearray([self._CMD_INIT, self._CMD_HOME])
-        self.send(msg)
+        self._send(self._PFX_HOME)
+        self._state.pop('cursor', None)
 
     #6.3
     def set_cursor_position(self, col, row):
-        msg = bytearray([self._CMD_INIT, self._CMD_CURSOR_POSITION, col, row])
-        self.send(msg)
+        if self._state.get('cursor') == ('position', col, row):
+            return
+        msg = self._PFX_CURSOR_POSITION + self._pack2(col, row)
+        self._send(msg)
+        self._state['cursor'] = ('position', col, row)
 
     # 6.4
     def set_cursor_coordinates(self, x, y):
-        msg = bytearray([self._CMD_INIT, self._CMD_CURSOR_COORDINATE, x, y])
-        self.send(msg)
+        if self._state.get('cursor') == ('coordinate', x, y):
+            return
+        msg = self._PFX_CURSOR_COORDINATE + self._pack2(x, y)
+        self._send(msg)
+        self._state['cursor'] = ('coordinate', x, y)
 
     # 6.5
     def enable_autoscroll(self):
-        msg = bytearray([self._CMD_INIT, self._CMD_AUTO_SCROLL_ON])
-        self.send(msg)
+        self._send(self._PFX_AUTO_SCROLL_ON)
 
     # 6.6
     def disable_autoscroll(self):
-        msg = bytearray([self._CMD_INIT, self._CMD_AUTO_SCROLL_OFF])
-        self.send(msg)
+        self._send(self._PFX_AUTO_SCROLL_OFF)
 
     def set_autoscroll(self, state=True):
         if state:
@@ -701,18 +1365,48 @@ class PyMoGlk:
             self.disable_autoscroll()
 
     #7.2
-    def upload_bitmap(self, ref, data):
-        # TODO: declare custom exceptions
+    def upload_bitmap(self, ref, data, w=None, h=None):
+        """Upload a bitmap file to the display's filesystem
+
+        data is either the packed bitmap file bytes, or a grid of 0/1
+        pixels when w and h are given; grids are packed host-side by
+        _pack_pixels (numpy.packbits when numpy is available) with the
+        width/height header prepended."""
         if self.mode == 'i2c':
             # FIXME: Should be a warning
             raise Exception
-        return NotImplemented
+        if w is not None:
+            data = self._pack2(w, h) + self._pack_pixels(w, h, data)
+        data = bytes(data)
+        self._send(self._PFX_UPLOAD_BMP + self._pack1(ref)
+                   + self._pack_le16(len(data)))
+        self._begin_transfer()
+        self._stream_acked(data)
 
     #7.3
     def draw_memory_bitmap(self, ref, x=0, y=0):
-        # TODO: make sure x/y is in available range for the display
-        msg = bytearray([self._CMD_INIT, self._CMD_DRAW_MEMORY_BMP, ref, x, y])
-        self.send(msg)
+        self._check_xy(x, y)
+        msg = self._PFX_DRAW_MEMORY_BMP + self._pack3(ref, x, y)
+        self._send(msg)
+
+    @staticmethod
+    def _pack_pixels(w, h, pixels):
+        # Pack a h x w grid of 0/1 pixels into the display's horizontal
+        # encoding, each row padded to a full byte (see BITMAP FILE FORMAT)
+        if numpy is not None:
+            arr = numpy.asarray(pixels, dtype=numpy.uint8).reshape(h, w)
+            return numpy.packbits(arr, axis=1).tobytes()
+        rows = pixels
+        if h and not isinstance(pixels[0], (list, tuple, bytes, bytearray)):
+            rows = [pixels[ry * w:(ry + 1) * w] for ry in range(h)]
+        row_bytes = (w + 7) // 8
+        packed = bytearray(h * row_bytes)
+        for ry, row in enumerate(rows):
+            base = ry * row_bytes
+            for rx, px in enumerate(row):
+                if px:
+                    packed[base + (rx >> 3)] |= 0x80 >> (rx & 7)
+        return bytes(packed)
 
     #7.4
     def draw_bitmap(self, w, h, data, x=0, y=0):
@@ -720,206 +1414,363 @@ class PyMoGlk:
         if self.mode == 'i2c':
             # FIXME: Should be a warning
             raise Exception
-        # TODO: check data is ok from w and h
-        raise NotImplementedError
-        msg = bytearray([self._CMD_INIT, self._CMD_DRAW_BMP, x, y, w, h, data])
-        self.send(msg)
+        if not isinstance(data, (bytes, bytearray, memoryview)):
+            data = self._pack_pixels(w, h, data)
+        msg = self._PFX_DRAW_BMP + self._pack4(x, y, w, h) + bytes(data)
+        self._send(msg)
 
     #8.2
     def set_drawing_color(self, color):
-        # TODO: declare custom exceptions
-        if not 0 <= color <= 255:
-            raise Exception
-        msg = bytearray([self._CMD_INIT, self._CMD_DRAWING_COLOR, color])
-        self.send(msg)
+        self._check(color, 0, 255, "color")
+        if self._state.get('color') == color:
+            return
+        msg = self._PFX_DRAWING_COLOR + self._pack1(color)
+        self._send(msg)
+        self._state['color'] = color
 
     #8.3
     def draw_pixel(self, x, y):
         # TODO: make sure x/y is OK for display
-        msg = bytearray([self._CMD_INIT, self._CMD_DRAW_PIXEL, x, y])
-        self.send(msg)
+        s = self._scratch
+        s[0] = self._CMD_INIT
+        s[1] = self._CMD_DRAW_PIXEL
+        s[2] = x
+        s[3] = y
+        self._send(self._scratch_mv[:4])
+
+    def draw_pixels(self, points):
+        """Draw a batch of pixels in one write
+
+        points is a sequence of (x, y) pairs. The frames are joined
+        host-side so a whole scatter costs one write instead of one
+        per pixel."""
+        pfx = self._PFX_DRAW_PIXEL
+        pack2 = self._pack2
+        self._send(b''.join(pfx + pack2(x, y) for x, y in points))
+
+    def draw_colored_pixels(self, pixels):
+        """Draw (color, x, y) pixels grouped by color in one write
+
+        The pixels are bucketed by color host-side, so each color costs
+        one drawing-color command followed by its pixel stream instead
+        of a color change per pixel. The drawing color is left at the
+        last group's color, mirrored in the state cache."""
+        groups = {}
+        for color, x, y in pixels:
+            groups.setdefault(color, []).append((x, y))
+        if not groups:
+            return
+        pfx_color = self._PFX_DRAWING_COLOR
+        pfx_pixel = self._PFX_DRAW_PIXEL
+        pack1 = self._pack1
+        pack2 = self._pack2
+        parts = []
+        for color, pts in groups.items():
+            parts.append(pfx_color + pack1(color))
+            parts.extend(pfx_pixel + pack2(x, y) for x, y in pts)
+        self._send(b''.join(parts))
+        self._state['color'] = color
+
+    @staticmethod
+    def _check(value, lo, hi, name):
+        # Shared range check so the bounds live in one place
+        if not lo <= value <= hi:
+            raise GlkValueError("%s must be within %d..%d" % (name, lo, hi))
+
+    def _check_xy(self, x, y):
+        """Reject coordinates off the display, when its size is known
+
+        hsize/vsize stay 0 until read_type has run, in which case the
+        check is a no-op; per-pixel hot paths (draw_pixel,
+        continue_line) skip it entirely and let the display clip."""
+        if self.hsize and not (0 <= x < self.hsize and 0 <= y < self.vsize):
+            raise GlkValueError("(%d, %d) is outside the %dx%d display"
+                                % (x, y, self.hsize, self.vsize))
 
     #8.4
     def draw_line(self, x1, y1, x2, y2):
-        # TODO: make sure x/y is OK for display
-        msg = bytearray([self._CMD_INIT, self._CMD_DRAW_LINE, x1, y1, x2, y2])
-        self.send(msg)
+        self._check_xy(x1, y1)
+        self._check_xy(x2, y2)
+        msg = self._PFX_DRAW_LINE + self._pack4(x1, y1, x2, y2)
+        self._send(msg)
+
+    def draw_hline(self, x, y, length):
+        # One line command instead of length pixel commands
+        self.draw_line(x, y, x + length - 1, y)
+
+    def draw_vline(self, x, y, length):
+        self.draw_line(x, y, x, y + length - 1)
 
     #8.5
     def continue_line(self, x, y):
         # TODO: make sure x/y is OK for display
-        msg = bytearray([self._CMD_INIT, self._CMD_CONTINUE_LINE, x, y])
-        self.send(msg)
+        s = self._scratch
+        s[0] = self._CMD_INIT
+        s[1] = self._CMD_CONTINUE_LINE
+        s[2] = x
+        s[3] = y
+        self._send(self._scratch_mv[:4])
+
+    def draw_polyline(self, points):
+        """Rasterize a polyline host-side and send it as one bitmap
+
+        points is a sequence of (x, y) vertices. The segments are
+        plotted with Bresenham into a grid covering their bounding box
+        and shipped with a single draw_bitmap, instead of one command
+        (and one wire turnaround) per segment. When the bounding box is
+        so sparse that the bitmap would cost more bytes than the line
+        commands, falls back to batched draw_line calls."""
+        if len(points) < 2:
+            if points:
+                self.draw_pixel(points[0][0], points[0][1])
+            return
+        xs = [p[0] for p in points]
+        ys = [p[1] for p in points]
+        minx, miny = min(xs), min(ys)
+        w = max(xs) - minx + 1
+        h = max(ys) - miny + 1
+        bitmap_cost = 6 + h * ((w + 7) // 8)
+        line_cost = 6 * (len(points) - 1)
+        if bitmap_cost >= line_cost:
+            with self.batch():
+                x0, y0 = points[0]
+                for x1, y1 in points[1:]:
+                    self.draw_line(x0, y0, x1, y1)
+                    x0, y0 = x1, y1
+            return
+        rows = [[0] * w for _ in range(h)]
+        x0, y0 = points[0]
+        for x1, y1 in points[1:]:
+            dx = abs(x1 - x0)
+            dy = -abs(y1 - y0)
+            sx = 1 if x0 < x1 else -1
+            sy = 1 if y0 < y1 else -1
+            err = dx + dy
+            cx, cy = x0, y0
+            while True:
+                rows[cy - miny][cx - minx] = 1
+                if cx == x1 and cy == y1:
+                    break
+                e2 = 2 * err
+                if e2 >= dy:
+                    err += dy
+                    cx += sx
+                if e2 <= dx:
+                    err += dx
+                    cy += sy
+            x0, y0 = x1, y1
+        self.draw_bitmap(w, h, rows, minx, miny)
 
     #8.6
     def draw_rectangle(self, color, x1, y1, x2, y2):
-        # TODO: make sure x/y is OK for display
-        msg = bytearray([self._CMD_INIT, self._CMD_DRAW_RECTANGLE, color, x1, y1, x2, y2])
-        self.send(msg)
+        self._check_xy(x1, y1)
+        self._check_xy(x2, y2)
+        msg = self._PFX_DRAW_RECTANGLE + self._pack5(color, x1, y1, x2, y2)
+        self._send(msg)
 
     #8.7
     def draw_solid_rectangle(self, color, x1, y1, x2, y2):
-        # TODO: make sure x/y is OK for display
-        msg = bytearray([self._CMD_INIT, self._CMD_DRAW_SOLID_RECTANGLE, color, x1, y1, x2, y2])
-        self.send(msg)
+        self._check_xy(x1, y1)
+        self._check_xy(x2, y2)
+        msg = self._PFX_DRAW_SOLID_RECTANGLE + self._pack5(color, x1, y1, x2, y2)
+        self._send(msg)
 
     #8.8
     def init_bargraph(self, ref, nature, x1, y1, x2, y2):
-        # TODO: declare custom exceptions
-        if not 0 <= ref <= 15:
-            raise Exception
-        if not 0 <= nature <= 3:
-            raise Exception
-        if x1 > x2:
-            raise Exception
-        if y1 > y2:
-            raise Exception
-        msg = bytearray([self._CMD_INIT, self._CMD_INITIALIZE_BAR_GRAPH, ref, nature, x1, y1, x2, y2])
-        self.send(msg)
+        self._check(ref, 0, 15, "ref")
+        self._check(nature, 0, 3, "nature")
+        if x1 > x2 or y1 > y2:
+            raise GlkValueError("x1,y1 must not exceed x2,y2")
+        msg = self._PFX_INITIALIZE_BAR_GRAPH + self._pack6(ref, nature, x1, y1, x2, y2)
+        self._send(msg)
 
     #8.9
     def draw_bargraph(self, ref, value):
-        msg = bytearray([self._CMD_INIT, self._CMD_DRAW_BAR_GRAPH, ref, value])
-        self.send(msg)
+        s = self._scratch
+        s[0] = self._CMD_INIT
+        s[1] = self._CMD_DRAW_BAR_GRAPH
+        s[2] = ref
+        s[3] = value
+        self._send(self._scratch_mv[:4])
+
+    def draw_bars(self, values):
+        """Update several bar graphs with one message
+
+        values is either a dict mapping bar graph ids to pixel values
+        or a sequence of values for ids counted from 0. The whole
+        refresh goes out in a single write instead of one per bar."""
+        if isinstance(values, dict):
+            items = values.items()
+        else:
+            items = enumerate(values)
+        pfx = self._PFX_DRAW_BAR_GRAPH
+        pack = self._pack2
+        msg = b''.join(pfx + pack(ref, value) for ref, value in items)
+        self._send(msg)
 
     #8.10
     def init_stripchart(self, ref, x1, y1, x2, y2):
-        # TODO: declare custom exceptions
-        if not 0 <= ref <= 6:
-            raise Exception
-        # X def must lie on byte boundaries
-        if x1 % '\x08' or x2 % '\x08':
-            raise Exception
-        msg = bytearray([self._CMD_INIT, self._CMD_INITIALIZE_STRIP_CHART, ref, x1, y1, x2, y2])
-        self.send(msg)
+        self._check(ref, 0, 6, "ref")
+        # X def must lie on byte boundaries; the old modulo against a
+        # one-char string was a TypeError on every call
+        if x1 & 7 or x2 & 7:
+            raise GlkValueError("x1 and x2 must be multiples of 8")
+        msg = self._PFX_INITIALIZE_STRIP_CHART + self._pack5(ref, x1, y1, x2, y2)
+        self._send(msg)
 
     #8.11
     def shift_stripchart(self, ref, direction):
         return NotImplemented
         #TODO: combine ref and direction respectively as LSB an MSB
-        msg = bytearray([self._CMD_INIT, self._CMD_SHIFT_STRIP_CHART, combined])
-        self.send(msg)
+        msg = self._PFX_SHIFT_STRIP_CHART + self._pack1(combined)
+        self._send(msg)
 
     #9.2
     def turn_gpo_off(self, num):
-        # TODO: declare custom exceptions
-        if not 0 < num <= 6:
-            raise Exception
-        msg = bytearray([self._CMD_INIT, self._CMD_GPO_OFF, num])
-        self.send(msg)
+        self._check(num, 1, 6, "GPO number")
+        self._send(self._GPO_CMDS[(num, False)])
 
     #9.3
     def turn_gpo_on(self, num):
-        # TODO: declare custom exceptions
-        if not 0 < num <= 6:
-            raise Exception
-        msg = bytearray([self._CMD_INIT, self._CMD_GPO_ON, num])
-        self.send(msg)
+        self._check(num, 1, 6, "GPO number")
+        self._send(self._GPO_CMDS[(num, True)])
 
     #9.4
     def set_startup_gpo_state(self, num, state):
-        # TODO: declare custom exceptions
-        if num == 0 or num > 6:
-            raise Exception
-        msg = bytearray([self._CMD_INIT, self._CMD_STARTUP_GPO_STATE, num, state])
-        self.send(msg)
+        self._check(num, 1, 6, "GPO number")
+        msg = self._PFX_STARTUP_GPO_STATE + self._pack2(num, state)
+        self._send(msg)
 
     def set_gpo(self, num, state, store=False):
-        # TODO: declare custom exceptions
-        if not 0 < num <= 6:
-            raise Exception
-        if state:
-            self.turn_gpo_on(num)
-        else:
-            self.turn_gpo_off(num)
+        self._check(num, 1, 6, "GPO number")
+        msg = self._GPO_CMDS[(num, bool(state))]
         if store:
-            self.set_startup_gpo_state(num, state)
+            # Both commands leave in one write
+            msg += self._PFX_STARTUP_GPO_STATE + self._pack2(num,
+                                                             1 if state else 0)
+        self._send(msg)
+
+    def set_gpos(self, states):
+        """Switch several GPOs in one write
+
+        states maps GPO number (1..6) to the wanted state; the on/off
+        commands are joined host-side so a whole transition costs one
+        write instead of one per output."""
+        frames = []
+        for num, state in states.items():
+            self._check(num, 1, 6, "GPO number")
+            frames.append(self._GPO_CMDS[(num, bool(state))])
+        self._send(b''.join(frames))
 
     def set_led(self, num, color, store=False):
-        if not 0 < num <= 3:
-            raise Exception
-        if store:
-            # TODO: use set_startup_gpo_state
-            raise NotImplementedError
-        if color == 'off':
-            self.turn_gpo_on(num * 2 - 1)
-            self.turn_gpo_on(num * 2)
-        if color == 'red':
-            self.turn_gpo_off(num * 2 - 1)
-            self.turn_gpo_on(num * 2)
-        if color == 'orange':
-            self.turn_gpo_off(num * 2 - 1)
-            self.turn_gpo_off(num * 2)
-        if color == 'green':
-            self.turn_gpo_on(num * 2 - 1)
-            self.turn_gpo_off(num * 2)
+        self._check(num, 1, 3, "LED number")
+        # One lookup, one write; unknown colors raise KeyError instead
+        # of silently doing nothing
+        table = self._LED_STORE_CMDS if store else self._LED_CMDS
+        self._send(table[(num, color)])
+
+    def set_leds(self, color1, color2, color3):
+        """Set all three keypad LEDs in one write
+
+        Each color is 'off', 'red', 'orange' or 'green'; the six GPO
+        commands for the frame come prebuilt from _LED_SET_CMDS."""
+        self._send(self._LED_SET_CMDS[(color1, color2, color3)])
 
     #10.2
     def enable_key_autotransmit(self):
-        msg = bytearray([self._CMD_INIT, self._CMD_AUTO_TRANSMIT_KEY_ON])
-        self.send(msg)
+        self._send(self._PFX_AUTO_TRANSMIT_KEY_ON)
 
     #10.3
     def disable_key_autotransmit(self):
-        msg = bytearray([self._CMD_INIT, self._CMD_AUTO_TRANSMIT_KEY_OFF])
-        self.send(msg)
+        self._send(self._PFX_AUTO_TRANSMIT_KEY_OFF)
+
+    def start_key_listener(self, callback):
+        """Dispatch auto-transmitted keypresses from a reader thread
+
+        Meant to follow enable_key_autotransmit(): the thread drains
+        the port as keys arrive and calls callback(keycode) for each,
+        so command writes overlap with keypad reception instead of the
+        host polling. The thread owns the receive side while running —
+        do not mix it with queries like read_version. Returns the
+        serial.threaded.ReaderThread; call .stop() to hand the port
+        back."""
+        from serial import threaded
+
+        class _KeyProtocol(threaded.Protocol):
+            def data_received(self, data):
+                for key in data:
+                    callback(key)
+
+        reader = threaded.ReaderThread(self.port, _KeyProtocol)
+        reader.start()
+        return reader
 
     #10.4
     def poll_keypress(self):
-        msg = bytearray([self._CMD_INIT, self._CMD_POLL_KEY])
-        self.send(msg)
-        result = []
-        # FIXME: this doesn't work
+        self._send(self._PFX_POLL_KEY)
+        # The keypad buffer holds at most 10 presses (see comment above)
+        result = bytearray(10)
+        nkeys = 0
         while True:
-            key = self.read()
-            if key != '\x00':
-                result.append(key)
-            if (struct.unpack('b', key)[0] & (1 << 7)) == 0:
+            # Drain everything already buffered in one read instead of
+            # one syscall (and one struct.unpack) per byte
+            data = self._read(1)
+            waiting = self.port.in_waiting
+            if waiting:
+                data += self._read(waiting)
+            if not data:
                 break
-            else:
-                print("DEBUG: keypress in buffer, reading again")
-        return result
+            for key in data:
+                if key != self._RET_NO_KEY:
+                    if nkeys < len(result):
+                        # Strip the continuation flag so stored codes
+                        # match the _RET_UP.._RET_RELEASE_BOTTOM constants
+                        result[nkeys] = key & 0x7F
+                        nkeys += 1
+            # MSB of the last code flags more key presses in the buffer
+            if not data[-1] & 0x80:
+                break
+            if __debug__ and self._DEBUG:
+                logger.debug("keypress in buffer, reading again")
+        return bytes(result[:nkeys])
 
     #10.5
     def clear_keybuffer(self):
-        msg = bytearray([self._CMD_INIT, self._CMD_CLEAR_KEY_BUFFER])
-        self.send(msg)
+        self._send(self._PFX_CLEAR_KEY_BUFFER)
 
     #10.6
     def set_debounce(self, time=8):
-        msg = bytearray([self._CMD_INIT, self._CMD_DEBOUNCE_TIME, time])
-        self.send(msg)
+        msg = self._PFX_DEBOUNCE_TIME + self._pack1(time)
+        self._send(msg)
 
     #10.7
     def set_autorepeat_mode(self, mode):
-        msg = bytearray([self._CMD_INIT, self._CMD_AUTO_REPEAT_MODE, mode])
-        self.send(msg)
+        msg = self._PFX_AUTO_REPEAT_MODE + self._pack1(mode)
+        self._send(msg)
 
     #10.8
     def disable_autorepeat(self):
-        msg = bytearray([self._CMD_INIT, self._CMD_AUTO_REPEAT_OFF])
-        self.send(msg)
+        self._send(self._PFX_AUTO_REPEAT_OFF)
 
     #10.9
     def assign_keycodes(self, kdown, kup):
         return NotImplemented
-        msg = bytearray([self._CMD_INIT, self._CMD_CUSTOM_KEYPAD_CODES, kdown, kup])
-        self.send(msg)
+        msg = self._PFX_CUSTOM_KEYPAD_CODES + self._pack2(kdown, kup)
+        self._send(msg)
 
     #11.2
     def clearscreen(self):
-        msg = bytearray([self._CMD_INIT, self._CMD_CLEAR_SCREEN])
-        self.send(msg)
+        self._send(self._PFX_CLEAR_SCREEN)
+        self._state.pop('cursor', None)
 
     #11.3
     def display_on(self, time=0):
-        msg = bytearray([self._CMD_INIT, self._CMD_DISPLAY_ON, time])
-        self.send(msg)
+        msg = self._PFX_DISPLAY_ON + self._pack1(time)
+        self._send(msg)
 
     #11.4
     def display_off(self):
-        msg = bytearray([self._CMD_INIT, self._CMD_DISPLAY_OFF])
-        self.send(msg)
+        self._send(self._PFX_DISPLAY_OFF)
 
     def set_backlight(self, state):
         if state:
@@ -929,390 +1780,277 @@ class PyMoGlk:
 
     #11.5
     def set_brightness(self, brightness=255):
-        msg = bytearray([self._CMD_INIT, self._CMD_BRIGHTNESS, brightness])
-        self.send(msg)
+        if self._state.get('brightness') == brightness:
+            return
+        msg = self._PFX_BRIGHTNESS + self._pack1(brightness)
+        self._send(msg)
+        self._state['brightness'] = brightness
 
     #11.6
     def set_save_brightness(self, brightness=255):
-        msg = bytearray([self._CMD_INIT, self._CMD_DEFAULT_BRIGHTNESS, brightness])
-        self.send(msg)
+        msg = self._PFX_DEFAULT_BRIGHTNESS + self._pack1(brightness)
+        self._send(msg)
 
     #11.7
     def set_contrast(self, contrast=128):
-        msg = bytearray([self._CMD_INIT, self._CMD_CONTRAST, contrast])
-        self.send(msg)
+        if self._state.get('contrast') == contrast:
+            return
+        msg = self._PFX_CONTRAST + self._pack1(contrast)
+        self._send(msg)
+        self._state['contrast'] = contrast
 
     #11.8
     def set_save_contrast(self, contrast=128):
-        msg = bytearray([self._CMD_INIT, self._CMD_DEFAULT_CONTRAST, contrast])
-        self.send(msg)
+        msg = self._PFX_DEFAULT_CONTRAST + self._pack1(contrast)
+        self._send(msg)
 
     #12.2
     def wipe_fs(self):
-        msg = bytearray([self._CMD_INIT, self._CMD_WIPE_FILESYSTEM])
-        self.send(msg)
+        self._send(self._PFX_WIPE_FILESYSTEM)
         return 'Restart display to ensure FS integrity'
 
     #12.3
     def delete_file(self, nature, ref):
-        # TODO: declare custom exceptions
         if not 0 <= nature <= 1:
-            raise Exception
-        msg = bytearray([self._CMD_INIT, self._CMD_DELETE_FILE, nature, ref])
-        self.send(msg)
+            raise FileRefError("type must be 0 (font) or 1 (bitmap)")
+        msg = self._PFX_DELETE_FILE + self._pack2(nature, ref)
+        self._send(msg)
         return 'Restart display to ensure FS integrity'
 
     #12.4
     def get_fs_space(self):
-        msg = bytearray([self._CMD_INIT, self._CMD_FREE_SPACE])
-        self.send(msg)
-        return self.read(self._RET_LENGTH_FREE_SPACE)
+        """Return the free filesystem space in bytes as an int"""
+        self._send(self._PFX_FREE_SPACE)
+        return self._read_u32_le()
+
+    def _read_u32_le(self):
+        # The 4-byte LSB-to-MSB size words decoded in one C call
+        data = self._read(4)
+        if len(data) != 4:
+            raise FileTransferError("no reply to the size query")
+        return self._unpack_u32(data)[0]
+
+    def _stream_acked(self, payload, window=32):
+        """Drive the byte-echo transfer protocol with a send window
+
+        The FILE TRANSFER PROTOCOL echoes every byte for the host to
+        confirm. Rather than a round trip per byte, a whole window is
+        written, its echo is read back in one sized read and verified,
+        and the confirmations leave as one write — per-window instead
+        of per-byte link latency."""
+        mv = memoryview(payload)
+        confirm = self._pack1(self._CMD_CONFIRM)
+        for pos in range(0, len(mv), window):
+            chunk = mv[pos:pos + window]
+            self._write(chunk)
+            # Straight into the ring: read()'s flow-control scan would
+            # mistake 0xFE/0xFF payload bytes in the echo for buffer
+            # markers and suspend host transmit mid-transfer
+            echo = self._read_into(len(chunk))
+            if echo != chunk:
+                self._write(self._pack1(self._CMD_DECLINE))
+                raise FileTransferError("transfer echo mismatch at byte %d"
+                                        % pos)
+            self._write(confirm * len(chunk))
+
+    def _begin_transfer(self):
+        # The display answers the transfer header with one byte
+        reply = self._read(1)
+        if not reply:
+            raise FileTransferError("no reply to the transfer header")
+        if reply[0] != self._RET_CONFIRM:
+            raise FileTransferError("display declined the transfer")
+        self._write(self._pack1(self._CMD_CONFIRM))
 
     #12.5
     def get_fs_dir(self):
-        msg = bytearray([self._CMD_INIT, self._CMD_DIRECTORY])
-        self.send(msg)
-        # TODO: parse result
-        return self.read(self._RET_LENGTH_DIRECTORY)
+        # The header byte gives the entry count: read exactly that many
+        # 4-byte entries instead of waiting out the receive timeout
+        header = self._xact(self._PFX_DIRECTORY, 1)
+        if not header:
+            return []
+        count = header[0]
+        entries = []
+        if count:
+            payload = self._read(4 * count)
+            # See DIRECTORY RETURN FORMAT: the low bit of the second
+            # byte is the file type, the rest is the file id
+            for flag, idtype, size in self._iter_dir_entries(payload):
+                entries.append({
+                    'used': bool(flag),
+                    'type': idtype & 1,
+                    'ref': idtype >> 1,
+                    'size': size,
+                })
+        return entries
 
     #12.6
     def upload_fs(self, data):
-        msg = bytearray([self._CMD_INIT, self._CMD_UPLOAD_FS, data])
-        self.send(msg)
+        # The image replaces the whole filesystem and must be exactly
+        # 16KB; it is far larger than the display's receive buffer, so
+        # it goes out through the flow-control-aware streamer
+        if len(data) != 16384:
+            raise GlkValueError("filesystem image must be 16KB")
+        self._send(self._PFX_UPLOAD_FS)
+        self._begin_transfer()
+        self._stream_acked(data)
 
     #12.7
     def download_file(self, nature, ref):
-        # TODO: declare custom exceptions
         if not 0 <= nature <= 1:
-            raise Exception
-        msg = bytearray([self._CMD_INIT, self._CMD_DOWNLOAD_FILE, nature, ref])
-        self.send(msg)
-        # TODO: handle file downloaad
-        size = self.read(self._RET_LENGTH_FILE_SIZE)
-        return NotImplemented
+            raise FileRefError("type must be 0 (font) or 1 (bitmap)")
+        self._send(self._PFX_DOWNLOAD_FILE + self._pack2(nature, ref))
+        size = self._read_u32_le()
+        # Bypass read()'s flow-control scan: binary payloads routinely
+        # contain the 0xFE/0xFF marker bytes
+        return bytes(self.read_view(size))
+
+    def prepare_download_file(self, nature):
+        # Specialized download_file for loops where the type is fixed:
+        # the three constant leading bytes are built once and the closure
+        # only appends the reference byte per call
+        if not 0 <= nature <= 1:
+            raise FileRefError("type must be 0 (font) or 1 (bitmap)")
+        prefix = self._PFX_DOWNLOAD_FILE + self._pack1(nature)
+        send = self._send
+        read_view = self.read_view
+        pack1 = self._pack1
+        read_u32 = self._read_u32_le
+
+        def _download_one(ref):
+            send(prefix + pack1(ref))
+            return bytes(read_view(read_u32()))
+
+        return _download_one
 
     #12.8
     def move_file(self, oldtype, oldref, newtype, newref):
-        # TODO: declare custom exceptions
-        if not (0 <= oldtype <= 1 or 0 <= newtype <= 1):
-            raise Exception
-        msg = bytearray([self._CMD_INIT, self._CMD_MOVE_FILE, oldtype, oldref, newtype, newref])
-        self.send(msg)
+        # Single branch, predictably not taken for valid calls: any bit
+        # above bit 0 means a type is out of range. The old check also
+        # or'ed the two conditions, so one valid type masked a bad one.
+        if (oldtype | newtype) & ~1:
+            raise FileRefError("type must be 0 (font) or 1 (bitmap)")
+        msg = self._PFX_MOVE_FILE + self._pack4(oldtype, oldref, newtype, newref)
+        self._send(msg)
+
+    def prepare_move_file(self, oldtype, newtype):
+        # Same specialization for bulk filesystem reshuffles: both type
+        # bytes are constant across the loop, only the references vary
+        if (oldtype | newtype) & ~1:
+            raise FileRefError("type must be 0 (font) or 1 (bitmap)")
+        prefix = self._PFX_MOVE_FILE + self._pack1(oldtype)
+        tail = self._pack1(newtype)
+        send = self._send
+        pack1 = self._pack1
+
+        def _move_one(oldref, newref):
+            send(prefix + pack1(oldref) + tail + pack1(newref))
+
+        return _move_one
 
     #13.2
     def set_remember(self, switch=0):
-        msg = bytearray([self._CMD_INIT, self._CMD_REMEMBER, switch])
-        self.send(msg)
+        msg = self._PFX_REMEMBER + self._pack1(switch)
+        self._send(msg)
 
     #13.3
     def set_locklevel(self, level):
-        msg = bytearray([self._CMD_INIT, self._CMD_LOCK_LEVEL, level])
-        self.send(msg)
+        msg = self._PFX_LOCK_LEVEL + self._pack1(level)
+        self._send(msg)
 
     #13.4
     def set_save_locklevel(self, level):
-        msg = bytearray([self._CMD_INIT, self._CMD_DEFAULT_LOCK_LEVEL, level])
-        self.send(msg)
+        msg = self._PFX_DEFAULT_LOCK_LEVEL + self._pack1(level)
+        self._send(msg)
 
     #13.5
-    def dump_fs(self):
-        msg = bytearray([self._CMD_INIT, self._CMD_DUMP_FS])
-        self.send(msg)
-        # TODO: handle file downloaad
-        size = self.read(self._RET_LENGTH_FILE_SIZE)
-        return NotImplemented
+    def dump_fs(self, view=False):
+        self._send(self._PFX_DUMP_FS)
+        size = self._read_u32_le()
+        if view:
+            # Zero-copy for callers that immediately hexdump, checksum
+            # or write the image to disk
+            return self.read_view(size)
+        # Still skip read()'s flow-control scan: a 16KB filesystem
+        # image is full of 0xFE/0xFF marker bytes
+        return bytes(self.read_view(size))
 
     #13.6
     def write_customerdata(self, data):
-        msg = bytearray([self._CMD_INIT, self._CMD_WRITE_CUSTOMER_DATA])
-        self.send(msg)
+        if isinstance(data, str):
+            data = data.encode('ascii')
+        if len(data) > self._RET_LENGTH_CUSTOMER_DATA:
+            raise GlkValueError("customer data is at most %d bytes"
+                                % self._RET_LENGTH_CUSTOMER_DATA)
+        # Pad to the full field: the display stores all 16 bytes, so a
+        # short write would otherwise leave stale tail bytes behind
+        data = bytes(data).ljust(self._RET_LENGTH_CUSTOMER_DATA, b'\x00')
+        # Header and payload joined into one message: bytes.join makes
+        # a single allocation sized to the total and one write follows
+        self._send(b''.join((self._PFX_WRITE_CUSTOMER_DATA, data)))
 
     #13.7
-    def read_customerdata(self):
-        msg = bytearray([self._CMD_INIT, self._CMD_READ_CUSTOMER_DATA])
-        self.send(msg)
-        return self.read(self._RET_LENGTH_CUSTOMER_DATA)
+    def read_customerdata(self, view=False):
+        if view:
+            # Zero-copy for callers that only slice or hexdump it
+            self._send(self._PFX_READ_CUSTOMER_DATA)
+            return self.read_view(self._RET_LENGTH_CUSTOMER_DATA)
+        return self._xact(self._PFX_READ_CUSTOMER_DATA,
+                          self._RET_LENGTH_CUSTOMER_DATA)
 
     #14.2
     def read_version(self, parse=True):
-        msg = bytearray([self._CMD_INIT, self._CMD_VERSION_NUMBER])
-        self.send(msg)
-        version = self.read(self._RET_LENGTH_VERSION_NUMBER)
+        version = self._version
+        if version is None:
+            version = self._xact(self._PFX_VERSION_NUMBER,
+                                 self._RET_LENGTH_VERSION_NUMBER)
+            # A timed-out empty reply is not cached, so the next call
+            # asks again; it cannot be parsed either
+            if not version:
+                raise FileTransferError("no reply to the version query")
+            self._version = version
         if parse:
             version = self._parse_version(version)
         return version
 
     @staticmethod
     def _parse_version(version):
-        hexversion = str(hexlify(version))
-        return "v" + hexversion[2] + "." + hexversion[3]
+        # One C call to hex the byte, then dot the two digits
+        hexversion = bytes(version).hex()
+        return "v" + hexversion[0] + "." + hexversion[1]
 
     #14.3
     def read_type(self, parse=True):
-        msg = bytearray([self._CMD_INIT, self._CMD_MODULE_TYPE])
-        self.send(msg)
-        lcdtype = self.read(self._RET_LENGTH_MODULE_TYPE)
+        lcdtype = self._module_type
+        if lcdtype is None:
+            lcdtype = self._xact(self._PFX_MODULE_TYPE,
+                                 self._RET_LENGTH_MODULE_TYPE)
+            # Same as read_version: a timed-out empty reply is neither
+            # cached nor parsed
+            if not lcdtype:
+                raise FileTransferError("no reply to the module type query")
+            self._module_type = lcdtype
         if parse:
             return self._parse_type(lcdtype)
         else:
             return lcdtype
 
     def _parse_type(self, nature):
-        lcdinfos = {
-            self._RET_LCD0821: {
-                'name': 'LCD0821',
-            },
-            self._RET_LCD2021: {
-                'name': 'LCD2021',
-            },
-            self._RET_LCD2041: {
-                'name': 'LCD2041',
-            },
-            self._RET_LCD4021: {
-                'name': 'LCD4021',
-            },
-            self._RET_LCD4041: {
-                'name': 'LCD4041',
-            },
-            self._RET_LK202_25: {
-                'name': 'LK202-25',
-            },
-            self._RET_LK204_25: {
-                'name': 'LK204-25',
-            },
-            self._RET_LK404_55: {
-                'name': 'LK404-55',
-            },
-            self._RET_VFD2021: {
-                'name': 'VFD2021',
-            },
-            self._RET_VFD2041: {
-                'name': 'VFD2041',
-            },
-            self._RET_VFD4021: {
-                'name': 'VFD4021',
-            },
-            self._RET_VK202_25: {
-                'name': 'VK202-25',
-            },
-            self._RET_VK204_25: {
-                'name': 'VK204-25',
-            },
-            self._RET_GLC12232: {
-                'name': 'GLC12232',
-                'hsize': 122,
-                'vsize': 32,
-            },
-            self._RET_GLC24064: {
-                'name': 'GLC24064',
-                'hsize': 240,
-                'vsize': 64,
-            },
-            self._RET_GLK24064_25: {
-                'name': 'GLK24064-25',
-                'hsize': 240,
-                'vsize': 64,
-            },
-            self._RET_GLK12232_25: {
-                'name': 'GLK12232-25',
-                'hsize': 122,
-                'vsize': 32,
-            },
-            self._RET_GLK12232_25_SM: {
-                'name': 'GLK12232-25-SM',
-                'hsize': 122,
-                'vsize': 32,
-            },
-            self._RET_GLK24064_16_1U_USB: {
-                'name': 'GLK24064-16-1U-USB',
-                'hsize': 240,
-                'vsize': 64,
-            },
-            self._RET_GLK24064_16_1U: {
-                'name': 'GLK24064-16-1U',
-                'hsize': 240,
-                'vsize': 64,
-            },
-            self._RET_GLK19264_7T_1U_USB: {
-                'name': 'GLK19264-7T-1U-USB',
-                'hsize': 192,
-                'vsize': 64,
-            },
-            self._RET_GLK12236_16: {
-                'name': 'GLK12236-16',
-                'hsize': 122,
-                'vsize': 36,
-            },
-            self._RET_GLK12232_16_SM: {
-                'name': 'GLK12236-16-SM',
-                'hsize': 122,
-                'vsize': 36,
-            },
-            self._RET_GLK19264_7T_1U: {
-                'name': 'GLK19264-7T-1U',
-                'hsize': 192,
-                'vsize': 64,
-            },
-            self._RET_LK204_7T_1U: {
-                'name': 'LK204-7T-1U',
-            },
-            self._RET_LK204_7T_1U_USB: {
-                'name': 'LK204-7T-1U-USB',
-            },
-            self._RET_LK404_AT: {
-                'name': 'LK404-AT',
-            },
-            self._RET_MOS_AV_162A: {
-                'name': 'MOS-AV-162A',
-            },
-            self._RET_LK402_12: {
-                'name': 'LK402-12',
-            },
-            self._RET_LK162_12: {
-                'name': 'LK162-12',
-            },
-            self._RET_LK204_25PC: {
-                'name': 'LK204-25PC',
-            },
-            self._RET_LK202_24_USB: {
-                'name': 'LK202-24-USB',
-            },
-            self._RET_VK202_24_USB: {
-                'name': 'VK202-24-USB',
-            },
-            self._RET_LK204_24_USB: {
-                'name': 'LK204-24-USB',
-            },
-            self._RET_VK204_24_USB: {
-                'name': 'VK204-24-USB',
-            },
-            self._RET_PK162_12: {
-                'name': 'PK162-12',
-            },
-            self._RET_VK162_12: {
-                'name': 'VK162-12',
-            },
-            self._RET_MOS_AP_162A: {
-                'name': 'MOS-AP-162A',
-            },
-            self._RET_PK202_25: {
-                'name': 'PK202-25',
-            },
-            self._RET_MOS_AL_162A: {
-                'name': 'MOS-AL-162A',
-            },
-            self._RET_MOS_AL_202A: {
-                'name': 'MOS-AL-202A',
-            },
-            self._RET_MOS_AV_202A: {
-                'name': 'MOS-AV-202A',
-            },
-            self._RET_MOS_AP_202A: {
-                'name': 'MOS-AP-202A',
-            },
-            self._RET_PK202_24_USB: {
-                'name': 'PK202-24-USB',
-            },
-            self._RET_MOS_AL_082: {
-                'name': 'MOS-AL-082',
-            },
-            self._RET_MOS_AL_204: {
-                'name': 'MOS-AL-204',
-            },
-            self._RET_MOS_AV_204: {
-                'name': 'MOS-AV-204',
-            },
-            self._RET_MOS_AL_402: {
-                'name': 'MOS-AL-402',
-            },
-            self._RET_MOS_AV_402: {
-                'name': 'MOS-AV-402',
-            },
-            self._RET_LK082_12: {
-                'name': 'LK082-12',
-            },
-            self._RET_VK402_12: {
-                'name': 'VK402-12',
-            },
-            self._RET_VK404_55: {
-                'name': 'VK404-55',
-            },
-            self._RET_LK402_25: {
-                'name': 'LK402-25',
-            },
-            self._RET_VK402_25: {
-                'name': 'VK402-25',
-            },
-            self._RET_PK204_25: {
-                'name': 'PK204-25',
-            },
-            self._RET_MOS: {
-                'name': 'MOS',
-            },
-            self._RET_MOI: {
-                'name': 'MOI',
-            },
-            self._RET_XBOARD_S: {
-                'name': 'XBOARD-S',
-            },
-            self._RET_XBOARD_I: {
-                'name': 'XBOARD-I',
-            },
-            self._RET_MOU: {
-                'name': 'MOU',
-            },
-            self._RET_XBOARD_U: {
-                'name': 'XBOARD-U',
-            },
-            self._RET_LK202_25_USB: {
-                'name': 'LK202-25-USB',
-            },
-            self._RET_VK202_25_USB: {
-                'name': 'VK202-25-USB',
-            },
-            self._RET_LK204_25_USB: {
-                'name': 'LK204-25-USB',
-            },
-            self._RET_VK204_25_USB: {
-                'name': 'VK204-25-USB',
-            },
-            self._RET_LK162_12_TC: {
-                'name': 'LK162-12-TC',
-            },
-            self._RET_GLK240128_25: {
-                'name': 'GLK240128-25',
-                'hsize': 240,
-                'vsize': 128,
-            },
-            self._RET_LK404_25: {
-                'name': 'LK404-25',
-            },
-            self._RET_VK404_25: {
-                'name': 'VK404-25',
-            },
-            self._RET_GLT320240: {
-                'name': 'GLT320240',
-                'hsize': 320,
-                'vsize': 240,
-            },
-            self._RET_GLT480282: {
-                'name': 'GLT480282',
-                'hsize': 480,
-                'vsize': 282,
-            },
-            self._RET_GLT240128: {
-                'name': 'GLT240128',
-                'hsize': 240,
-                'vsize': 128,
-            },
-        }.get(int.from_bytes(nature, 'big'))
+        lcdinfos = self._LCD_INFOS.get(nature[0])
 
-        if self._DEBUG:
-            print("DEBUG: type infos")
-            print(lcdinfos)
+        if __debug__ and self._DEBUG:
+            logger.debug("type infos: %s", lcdinfos)
+
+        if lcdinfos is None:
+            # A module newer than the table: still usable, just unnamed
+            self.name = 'UNKNOWN'
+            self.hsize = 0
+            self.vsize = 0
+            return self.name
 
         self.name = lcdinfos['name']
-        self.hsize = lcdinfos['hsize']
-        self.vsize = lcdinfos['vsize']
+        # Character modules have no pixel dimensions in the table
+        self.hsize = lcdinfos.get('hsize', 0)
+        self.vsize = lcdinfos.get('vsize', 0)
 
         return self.name
\ No newline at end of file
@@ -5,76 +5,74 @@ import time
 import math
 from itertools import cycle
 
+# Bargraph value for each whole degree, computed once: the sinwave loop
+# indexes this instead of paying two math calls and the float scaling
+# per frame
+_SIN_BAR = tuple(int((math.sin(math.radians(a)) + 1) / 2 * 55.0)
+                 for a in range(360))
+
 def tricolor_light():
-    lcd.set_led(1, 'red')
-    lcd.set_led(2, 'off')
-    lcd.set_led(3, 'off')
+    lcd.set_leds('red', 'off', 'off')
     time.sleep(1)
-    lcd.set_led(1, 'off')
-    lcd.set_led(2, 'orange')
-    lcd.set_led(3, 'off')
+    lcd.set_leds('off', 'orange', 'off')
     time.sleep(1)
-    lcd.set_led(1, 'off')
-    lcd.set_led(2, 'off')
-    lcd.set_led(3, 'green')
+    lcd.set_leds('off', 'off', 'green')
     time.sleep(1)
 
 
-def blink_green():
+def blink_green(period=0.5):
+    # Deadline pacing: each phase starts period seconds after the
+    # previous one regardless of how long the writes took, so the blink
+    # does not drift
+    deadline = time.monotonic()
+    state = False
     while True:
-        lcd.set_led(1, 'green')
-        lcd.set_led(2, 'green')
-        lcd.set_led(3, 'green')
-        time.sleep(0.5)
-        lcd.set_led(1, 'off')
-        lcd.set_led(2, 'off')
-        lcd.set_led(3, 'off')
-        time.sleep(0.5)
+        state = not state
+        lcd.set_leds(*(('green',) * 3 if state else ('off',) * 3))
+        deadline += period
+        time.sleep(max(0.0, deadline - time.monotonic()))
 
 
 def sixteen_bargraph():
-    lcd.set_font(1)
-    lcd.set_font_metrics(0, 0, 0, 0, 0)
-    for num in range(1, 17):
-        lcd.set_cursor_position(num * 2 - 1, 9)
-        lcd.write(str(num))
-        lcd.init_bargraph(num - 1, 0, ((num - 1) * 8) + (4 * (num - 1)), 0, (num * 8 - 1) + (4 * num), 54)
+    # One write for the whole setup: every command (and the labels)
+    # coalesces in the batch instead of costing a syscall each
+    with lcd.batch():
+        lcd.set_font(1)
+        lcd.set_font_metrics(0, 0, 0, 0, 0)
+        for num in range(1, 17):
+            lcd.set_cursor_position(num * 2 - 1, 9)
+            lcd.write(str(num))
+            lcd.init_bargraph(num - 1, 0, ((num - 1) * 8) + (4 * (num - 1)), 0, (num * 8 - 1) + (4 * num), 54)
 
 
 def sinwave():
     num = 1
     for angle in cycle(range(0, 360, 1)):
-        y = math.sin(math.radians(angle))
-        y += 1
-        y /= 2
-        value = int(y * 55.0)
-        lcd.draw_bargraph(num, value)
+        lcd.draw_bargraph(num, _SIN_BAR[angle])
         if num < 16:
             num += 1
         else:
             num = 1
 
 
-lcd = glk.PyMoGlk(_debug=True)
-
-lcd.clearscreen()
-lcd.set_backlight(True)
+with glk.PyMoGlk(_debug=True) as lcd:
+    lcd.clearscreen()
+    lcd.set_backlight(True)
 
-print(lcd.read_type())
-print(lcd.read_version())
+    print(lcd.read_type())
+    print(lcd.read_version())
 
-#tricolor_light()
-#blink_green()
+    #tricolor_light()
+    #blink_green()
 
-#sixteen_bargraph()
-#sinwave()
+    #sixteen_bargraph()
+    #sinwave()
 
-#for i in range(1, 6):
-#    lcd.set_gpo(i, True)
-#    lcd.set_gpo(i+1, False)
-#    time.sleep(1)
-#    lcd.set_gpo(i, False)
+    #for i in range(1, 6):
+    #    lcd.set_gpos({i: True, i + 1: False})
+    #    time.sleep(1)
+    #    lcd.set_gpo(i, False)
 
 
-#lcd.disable_key_autotransmit()
-#print(lcd.poll_keypress())
+    #lcd.disable_key_autotransmit()
+    #print(lcd.poll_keypress())